@@ -2,14 +2,30 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any
 
 from flask import Flask
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import event, text
 
 from .config import Config
 from .extensions import db
-from .models import ensure_default_user, ensure_user_role_column
-from .aoi import aoi_bp, ensure_problem_codes
+from .json_provider import register_json_provider
+from .models import (
+    ensure_declared_indexes,
+    ensure_default_user,
+    ensure_session_event_area_column,
+    ensure_user_role_column,
+)
+from .aoi import (
+    aoi_bp,
+    ensure_aoi_uuid_format,
+    ensure_line_item_position_columns,
+    ensure_problem_codes,
+    get_problem_codes,
+)
 from .routes.auth import auth_bp
+from .services.session_events import init_session_events
 
 
 def create_app(config_object: type[Config] | None = None) -> Flask:
@@ -23,6 +39,9 @@ def create_app(config_object: type[Config] | None = None) -> Flask:
     """
     app = Flask(__name__, instance_relative_config=True)
     app.config.from_object(config_object or Config())
+    # Template options must be set before the JSON provider touches jinja_env.
+    configure_templates(app)
+    register_json_provider(app)
 
     register_extensions(app)
     register_blueprints(app)
@@ -36,9 +55,49 @@ def create_app(config_object: type[Config] | None = None) -> Flask:
     return app
 
 
+def configure_templates(app: Flask) -> None:
+    """Persist compiled templates so each new worker skips recompiling them."""
+    cache_dir = Path(app.instance_path) / "jinja_cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    app.jinja_options = {
+        **app.jinja_options,
+        "bytecode_cache": FileSystemBytecodeCache(str(cache_dir)),
+    }
+
+
 def register_extensions(app: Flask) -> None:
     """Register Flask extensions."""
     db.init_app(app)
+    configure_sqlite(app)
+    init_session_events(app)
+
+
+# Applied to every new SQLite connection. WAL lets dashboard reads proceed
+# while a form is being written, and NORMAL sync is durable under WAL except
+# for power loss; temp tables and a 256 MiB memory map keep hot reads off disk.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def configure_sqlite(app: Flask) -> None:
+    """Install the connection pragmas on ``app``'s engine when it is SQLite."""
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
 
 
 def register_blueprints(app: Flask) -> None:
@@ -53,5 +112,28 @@ def initialize_database(app: Flask) -> None:
         Path(app.instance_path).mkdir(parents=True, exist_ok=True)
         db.create_all()
         ensure_user_role_column()
+        ensure_session_event_area_column()
+        ensure_aoi_uuid_format()
+        ensure_line_item_position_columns()
+        ensure_declared_indexes()
         ensure_default_user()
         ensure_problem_codes()
+        warm_connection_pool()
+        get_problem_codes()
+
+
+def warm_connection_pool() -> None:
+    """Open and ping one connection per pool slot so requests start warm."""
+
+    pool_size = getattr(db.engine.pool, "size", None)
+    slots = pool_size() if callable(pool_size) else 1
+
+    connections = []
+    try:
+        for _ in range(max(slots, 1)):
+            connection = db.engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
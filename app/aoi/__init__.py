@@ -13,6 +13,16 @@ aoi_bp = Blueprint(
 
 
 from . import routes  # noqa: E402  # pylint: disable=wrong-import-position
-from .service import ensure_problem_codes  # noqa: E402
+from .models import (  # noqa: E402
+    ensure_aoi_uuid_format,
+    ensure_line_item_position_columns,
+)
+from .service import ensure_problem_codes, get_problem_codes  # noqa: E402
 
-__all__ = ["aoi_bp", "ensure_problem_codes"]
+__all__ = [
+    "aoi_bp",
+    "ensure_aoi_uuid_format",
+    "ensure_line_item_position_columns",
+    "ensure_problem_codes",
+    "get_problem_codes",
+]
@@ -2,24 +2,22 @@
 from __future__ import annotations
 
 import uuid
-from dataclasses import dataclass
 from datetime import date, datetime
 
-from sqlalchemy import CheckConstraint, ForeignKey
+from sqlalchemy import CheckConstraint, ForeignKey, inspect, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..extensions import db
 
 
-@dataclass
 class AoiProblemCode(db.Model):
     """Authoritative list of AOI problem codes."""
 
     __tablename__ = "aoi_problem_codes"
 
-    code: int = mapped_column(db.Integer, primary_key=True)
-    name: str = mapped_column(db.String(120), nullable=False, unique=True)
-    part_type: str | None = mapped_column(db.String(120), nullable=True)
+    code: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(db.String(120), nullable=False, unique=True)
+    part_type: Mapped[str | None] = mapped_column(db.String(120), nullable=True)
 
     def to_dict(self) -> dict[str, str | int | None]:
         return {
@@ -29,45 +27,51 @@ class AoiProblemCode(db.Model):
         }
 
 
-@dataclass
 class AoiForm(db.Model):
     """Master record of an AOI inspection form."""
 
     __tablename__ = "aoi_forms"
 
-    id: str = mapped_column(
-        db.String(36),
-        primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+    id: Mapped[uuid.UUID] = mapped_column(db.Uuid, primary_key=True, default=uuid.uuid4)
+    date: Mapped[date] = mapped_column(db.Date, nullable=False)
+    type: Mapped[str] = mapped_column(db.String(8), nullable=False)
+    form_number: Mapped[str] = mapped_column(db.String(32), nullable=False, default="Form-114")
+    form_rev: Mapped[str] = mapped_column(
+        db.String(64), nullable=False, default="Rev. 17 (9/9/2025)"
     )
-    date: date = mapped_column(db.Date, nullable=False)
-    type: str = mapped_column(db.String(8), nullable=False)
-    form_number: str = mapped_column(db.String(32), nullable=False, default="Form-114")
-    form_rev: str = mapped_column(db.String(64), nullable=False, default="Rev. 17 (9/9/2025)")
-    customer: str | None = mapped_column(db.String(255), nullable=True)
-    assembly: str | None = mapped_column(db.String(255), nullable=True)
-    job_number: str | None = mapped_column(db.String(255), nullable=True)
-    revision: str | None = mapped_column(db.String(255), nullable=True)
-    panels_count: int | None = mapped_column(db.Integer, nullable=True)
-    boards_count: int | None = mapped_column(db.Integer, nullable=True)
-    inspector: str | None = mapped_column(db.String(255), nullable=True)
-    qty_inspected: int = mapped_column(db.Integer, nullable=False, default=0)
-    qty_rejected: int = mapped_column(db.Integer, nullable=False, default=0)
-    qty_accepted: int = mapped_column(db.Integer, nullable=False, default=0)
-    comments: str | None = mapped_column(db.Text, nullable=True)
-    status: str = mapped_column(db.String(16), nullable=False, default="submitted")
-    created_at: datetime = mapped_column(
+    customer: Mapped[str | None] = mapped_column(db.String(255), nullable=True)
+    assembly: Mapped[str | None] = mapped_column(db.String(255), nullable=True)
+    job_number: Mapped[str | None] = mapped_column(db.String(255), nullable=True)
+    revision: Mapped[str | None] = mapped_column(db.String(255), nullable=True)
+    panels_count: Mapped[int | None] = mapped_column(db.Integer, nullable=True)
+    boards_count: Mapped[int | None] = mapped_column(db.Integer, nullable=True)
+    inspector: Mapped[str | None] = mapped_column(db.String(255), nullable=True)
+    qty_inspected: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+    qty_rejected: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+    qty_accepted: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+    comments: Mapped[str | None] = mapped_column(db.Text, nullable=True)
+    status: Mapped[str] = mapped_column(db.String(16), nullable=False, default="submitted")
+    created_at: Mapped[datetime] = mapped_column(
         db.DateTime, nullable=False, default=datetime.utcnow
     )
-    updated_at: datetime = mapped_column(
+    updated_at: Mapped[datetime] = mapped_column(
         db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Line items keep the order they were entered in. ``id`` only makes the
+    # order stable for legacy rows that ``position`` could not be backfilled
+    # for (see ``ensure_line_item_position_columns``).
     rejections: Mapped[list["AoiRejection"]] = relationship(
-        "AoiRejection", cascade="all, delete-orphan", back_populates="form"
+        "AoiRejection",
+        cascade="all, delete-orphan",
+        back_populates="form",
+        order_by="(AoiRejection.position, AoiRejection.id)",
     )
     board_data: Mapped[list["AoiBoardData"]] = relationship(
-        "AoiBoardData", cascade="all, delete-orphan", back_populates="form"
+        "AoiBoardData",
+        cascade="all, delete-orphan",
+        back_populates="form",
+        order_by="(AoiBoardData.position, AoiBoardData.id)",
     )
 
     __table_args__ = (
@@ -76,61 +80,124 @@ class AoiForm(db.Model):
         CheckConstraint("qty_accepted >= 0", name="aoi_qty_accepted_non_negative"),
         CheckConstraint("status in ('draft','submitted')", name="aoi_status_valid"),
         CheckConstraint("type in ('SMT','TH')", name="aoi_type_valid"),
+        db.Index("ix_aoi_forms_date", "date"),
     )
 
 
-@dataclass
 class AoiRejection(db.Model):
     """Line items for rejection reasons."""
 
     __tablename__ = "aoi_rejections"
 
-    id: str = mapped_column(
-        db.String(36),
-        primary_key=True,
-        default=lambda: str(uuid.uuid4()),
-    )
-    form_id: str = mapped_column(
-        db.String(36),
+    id: Mapped[uuid.UUID] = mapped_column(db.Uuid, primary_key=True, default=uuid.uuid4)
+    form_id: Mapped[uuid.UUID] = mapped_column(
+        db.Uuid,
         ForeignKey("aoi_forms.id", ondelete="CASCADE"),
         nullable=False,
     )
-    quantity: int = mapped_column(db.Integer, nullable=False)
-    problem_code: int = mapped_column(
+    position: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+    quantity: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    problem_code: Mapped[int] = mapped_column(
         db.Integer, ForeignKey("aoi_problem_codes.code"), nullable=False
     )
-    reference_designators: str | None = mapped_column(db.Text, nullable=True)
+    reference_designators: Mapped[str | None] = mapped_column(db.Text, nullable=True)
 
     form: Mapped[AoiForm] = relationship("AoiForm", back_populates="rejections")
     problem: Mapped[AoiProblemCode] = relationship("AoiProblemCode")
 
     __table_args__ = (
         CheckConstraint("quantity >= 1", name="aoi_rejection_quantity_positive"),
+        # Leads with ``form_id`` for per-form child loads and also covers
+        # grouping a form's rejections by problem code.
+        db.Index("ix_aoi_rejections_form_id_problem_code", "form_id", "problem_code"),
     )
 
 
-@dataclass
 class AoiBoardData(db.Model):
     """Optional board-level inspection details."""
 
     __tablename__ = "aoi_board_data"
 
-    id: str = mapped_column(
-        db.String(36),
-        primary_key=True,
-        default=lambda: str(uuid.uuid4()),
-    )
-    form_id: str = mapped_column(
-        db.String(36),
+    id: Mapped[uuid.UUID] = mapped_column(db.Uuid, primary_key=True, default=uuid.uuid4)
+    form_id: Mapped[uuid.UUID] = mapped_column(
+        db.Uuid,
         ForeignKey("aoi_forms.id", ondelete="CASCADE"),
         nullable=False,
     )
-    board_id: str | None = mapped_column(db.String(255), nullable=True)
-    reference_designators: str | None = mapped_column(db.Text, nullable=True)
-    problem_code: int | None = mapped_column(
+    position: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+    board_id: Mapped[str | None] = mapped_column(db.String(255), nullable=True)
+    reference_designators: Mapped[str | None] = mapped_column(db.Text, nullable=True)
+    problem_code: Mapped[int | None] = mapped_column(
         db.Integer, ForeignKey("aoi_problem_codes.code"), nullable=True
     )
-    comments: str | None = mapped_column(db.Text, nullable=True)
+    comments: Mapped[str | None] = mapped_column(db.Text, nullable=True)
 
     form: Mapped[AoiForm] = relationship("AoiForm", back_populates="board_data")
     problem: Mapped[AoiProblemCode] = relationship("AoiProblemCode")
+
+    __table_args__ = (db.Index("ix_aoi_board_data_form_id", "form_id"),)
+
+
+def ensure_line_item_position_columns() -> None:
+    """Add the ``position`` column to AOI line-item tables that predate it.
+
+    On SQLite existing rows are numbered per form in insertion (``rowid``)
+    order. Other databases have no insertion order to recover, so existing rows
+    keep position ``0`` and their relative order is undefined.
+    """
+
+    engine = db.engine
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    with engine.begin() as connection:
+        for table_name in (AoiRejection.__tablename__, AoiBoardData.__tablename__):
+            if table_name not in tables:
+                continue
+            columns = {column_info["name"] for column_info in inspector.get_columns(table_name)}
+            if "position" not in columns:
+                connection.execute(
+                    text(
+                        f"ALTER TABLE {table_name} "
+                        "ADD COLUMN position INTEGER NOT NULL DEFAULT 0"
+                    )
+                )
+                if engine.dialect.name == "sqlite":
+                    connection.execute(
+                        text(
+                            f"UPDATE {table_name} SET position = ("
+                            f"SELECT COUNT(*) FROM {table_name} AS earlier "
+                            f"WHERE earlier.form_id = {table_name}.form_id "
+                            f"AND earlier.rowid < {table_name}.rowid)"
+                        )
+                    )
+
+
+def ensure_aoi_uuid_format() -> None:
+    """Rewrite AOI keys stored as dashed strings into the ``Uuid`` format.
+
+    AOI ids used to be ``String(36)`` columns holding dashed UUIDs, while
+    ``db.Uuid`` stores 32-character hex on SQLite; rows written before the
+    switch would otherwise no longer match their own ids or parent form.
+    """
+
+    engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return
+
+    tables = set(inspect(engine).get_table_names())
+    columns_by_table = {
+        AoiForm.__tablename__: ("id",),
+        AoiRejection.__tablename__: ("id", "form_id"),
+        AoiBoardData.__tablename__: ("id", "form_id"),
+    }
+    with engine.begin() as connection:
+        for table_name, columns in columns_by_table.items():
+            if table_name not in tables:
+                continue
+            for column in columns:
+                connection.execute(
+                    text(
+                        f"UPDATE {table_name} SET {column} = REPLACE({column}, '-', '') "
+                        f"WHERE {column} LIKE '%-%'"
+                    )
+                )
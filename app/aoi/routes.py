@@ -1,9 +1,14 @@
 """Route handlers for AOI inspection forms."""
 from __future__ import annotations
 
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import date
+from threading import Lock
 
-from flask import Response, jsonify, render_template, request, url_for
+from flask import Response, abort, jsonify, render_template, request, url_for
+from sqlalchemy import select
 
 from ..extensions import db
 from . import aoi_bp
@@ -12,18 +17,40 @@ from .service import (
     ValidationError,
     compute_qty_accepted,
     create_form,
-    ensure_problem_codes,
     get_known_inspectors,
+    get_problem_code_etag,
+    get_problem_code_version,
     get_problem_codes,
+    load_form,
     serialize_form,
 )
 
 
-@aoi_bp.before_app_request
-def ensure_lookup_seeded() -> None:
-    """Seed lookup values on first request."""
+# Rendered print HTML and PDF bytes keyed by (form id, updated_at, problem code
+# version, format). Bounded so rarely printed forms age out.
+_PrintCacheKey = tuple[uuid.UUID, str, int, str]
+_PRINT_CACHE_SIZE = 128
+_PRINT_CACHE: OrderedDict[_PrintCacheKey, str | bytes] = OrderedDict()
+_PRINT_CACHE_LOCK = Lock()
 
-    ensure_problem_codes()
+
+def _get_form_or_404(form_id: uuid.UUID) -> AoiForm:
+    """Return the eager-loaded form for ``form_id`` or abort with 404."""
+
+    form = load_form(form_id)
+    if form is None:
+        abort(404)
+    return form
+
+
+@aoi_bp.context_processor
+def inject_lookup_helpers() -> dict[str, object]:
+    """Expose shared lookup data to every AOI template."""
+
+    return {
+        "problem_codes": get_problem_codes(),
+        "compute_qty_accepted": compute_qty_accepted,
+    }
 
 
 @aoi_bp.get("/new")
@@ -31,12 +58,10 @@ def new_form() -> str:
     """Render a new AOI inspection form."""
 
     inspectors = get_known_inspectors()
-    codes = get_problem_codes()
     return render_template(
         "aoi/form.html",
         today=date.today(),
         inspectors=inspectors,
-        problem_codes=codes,
     )
 
 
@@ -69,30 +94,29 @@ def submit_form() -> Response:
     )
 
 
-@aoi_bp.get("/<form_id>")
-def view_form(form_id: str) -> str:
+@aoi_bp.get("/<uuid:form_id>")
+def view_form(form_id: uuid.UUID) -> str:
     """Display a saved AOI form."""
 
-    form = AoiForm.query.get_or_404(form_id)
-    return render_template(
-        "aoi/view.html",
-        form=form,
-        problem_codes=get_problem_codes(),
-        compute_qty_accepted=compute_qty_accepted,
-    )
+    form = _get_form_or_404(form_id)
+    return render_template("aoi/view.html", form=form)
 
 
-@aoi_bp.get("/<form_id>/print")
-def print_form(form_id: str) -> Response:
+@aoi_bp.get("/<uuid:form_id>/print")
+def print_form(form_id: uuid.UUID) -> Response:
     """Render a print/PDF friendly layout."""
 
-    form = AoiForm.query.get_or_404(form_id)
+    updated_at = db.session.scalar(
+        select(AoiForm.updated_at).where(AoiForm.id == form_id)
+    )
+    if updated_at is None:
+        abort(404)
+
     format_hint = request.args.get("format")
+    cache_key = (form_id, updated_at.isoformat(), get_problem_code_version())
 
-    html = render_template(
-        "aoi/print.html",
-        form=form,
-        problem_codes=get_problem_codes(),
+    html = _cached_print_output(
+        cache_key + ("html",), lambda: _render_print_html(form_id)
     )
 
     if format_hint == "pdf":
@@ -109,18 +133,76 @@ def print_form(form_id: str) -> Response:
                 501,
             )
 
-        pdf = HTML(string=html).write_pdf()
+        # The HTML already holds everything the PDF needs; return the pooled
+        # connection before the comparatively slow WeasyPrint render.
+        db.session.close()
+        pdf = _cached_print_output(
+            cache_key + ("pdf",),
+            lambda: HTML(string=html).write_pdf(optimize_images=True, jpeg_quality=75),
+        )
         response = Response(pdf, mimetype="application/pdf")
         response.headers["Content-Disposition"] = (
-            f"inline; filename=aoi-form-{form.id}.pdf"
+            f"inline; filename=aoi-form-{form_id}.pdf"
         )
         return response
 
     return Response(html, mimetype="text/html")
 
 
+def _render_print_html(form_id: uuid.UUID) -> str:
+    """Render the print template for ``form_id``."""
+
+    return render_template("aoi/print.html", form=_get_form_or_404(form_id))
+
+
+def _cached_print_output(
+    key: _PrintCacheKey, render: Callable[[], str | bytes]
+) -> str | bytes:
+    """Return the cached output for ``key``, rendering and storing it on a miss.
+
+    Keys include the form's ``updated_at`` stamp and the problem code version,
+    so edits and lookup changes naturally produce new entries.
+    """
+
+    with _PRINT_CACHE_LOCK:
+        cached = _PRINT_CACHE.get(key)
+        if cached is not None:
+            _PRINT_CACHE.move_to_end(key)
+            return cached
+
+    output = render()
+
+    with _PRINT_CACHE_LOCK:
+        _PRINT_CACHE[key] = output
+        _PRINT_CACHE.move_to_end(key)
+        while len(_PRINT_CACHE) > _PRINT_CACHE_SIZE:
+            _PRINT_CACHE.popitem(last=False)
+    return output
+
+
 @aoi_bp.get("/codes")
 def problem_code_lookup() -> Response:
-    """Provide the authoritative list of problem codes."""
+    """Provide the authoritative list of problem codes.
+
+    Responses carry a weak ETag so clients can revalidate with
+    ``If-None-Match`` and receive an empty ``304`` while the codes are unchanged.
+    An empty list is not cached, since the codes may not have synced yet.
+    """
+
+    codes = get_problem_codes()
+    if not codes:
+        response = jsonify({"problem_codes": codes})
+        response.headers["Cache-Control"] = "no-cache"
+        response.vary.add("Accept-Encoding")
+        return response
+
+    etag = get_problem_code_etag()
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify({"problem_codes": codes})
 
-    return jsonify({"problem_codes": get_problem_codes()})
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "private, max-age=300"
+    response.vary.add("Accept-Encoding")
+    return response
@@ -1,27 +1,68 @@
 """Business logic helpers for the AOI inspection module."""
 from __future__ import annotations
 
+import hashlib
+import json
+import time
+import uuid
 from collections.abc import Iterable
 from datetime import date
+from operator import attrgetter
 from typing import Any
 
-from flask import current_app
+from flask import current_app, g
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from ..extensions import db
-from ..models import User
-from ..services.supabase import (
-    SupabaseConfigurationError,
-    SupabaseRequestError,
-    fetch_defect_definitions,
-)
 from .models import AoiBoardData, AoiForm, AoiProblemCode, AoiRejection
 
 
+# Serialised problem codes shared across requests. ``ensure_problem_codes``
+# bumps the version and drops the cache whenever the table changes.
+_PROBLEM_CODE_CACHE: list[dict[str, int | str | None]] | None = None
+_PROBLEM_CODE_NAMES: dict[int, str] | None = None
+_PROBLEM_CODE_DIGEST: str | None = None
+_PROBLEM_CODE_VERSION = 0
+
+# Inspector usernames change rarely, so they are reused for a short period.
+_INSPECTORS_CACHE_TTL = 60.0
+_INSPECTORS_CACHE: tuple[float, list[str]] | None = None
+
+_VALID_STATUSES = frozenset({"draft", "submitted"})
+_VALID_TYPES = frozenset({"SMT", "TH"})
+
+
 def ensure_problem_codes() -> None:
-    """Synchronise AOI problem codes with the Supabase ``defects`` table."""
+    """Synchronise AOI problem codes with the Supabase ``defects`` table.
+
+    Marks the sync as attempted for the current app context, so a following
+    cold :func:`get_problem_codes` does not repeat it.
+    """
+
+    g.aoi_problem_code_sync_attempted = True
+
+    # Imported lazily so importing this module does not pull in the HTTP client.
+    from ..services.supabase import (
+        SupabaseConfigurationError,
+        SupabaseRequestError,
+        fetch_defect_definitions_if_changed,
+        get_defects_etag,
+    )
+
+    existing = {
+        row.code: (row.name, row.part_type)
+        for row in db.session.execute(
+            select(AoiProblemCode.code, AoiProblemCode.name, AoiProblemCode.part_type)
+        )
+    }
+    # Only revalidate against the last tag while local rows exist; an empty
+    # table always needs the full payload.
+    known_etag = get_defects_etag() if existing else None
 
     try:
-        defects = fetch_defect_definitions()
+        defects, _ = fetch_defect_definitions_if_changed(known_etag)
     except SupabaseConfigurationError as exc:
         current_app.logger.warning("Skipping AOI problem code sync: %s", exc)
         return
@@ -29,45 +70,48 @@ def ensure_problem_codes() -> None:
         current_app.logger.error("Failed to synchronise AOI problem codes: %s", exc)
         return
 
-    existing = {problem.code: problem for problem in AoiProblemCode.query.all()}
+    if defects is None:
+        current_app.logger.debug(
+            "AOI problem codes unchanged upstream (%s entries)", len(existing)
+        )
+        return
+
     incoming_ids: set[int] = set()
-    changed = False
+    inserts: list[dict[str, int | str | None]] = []
+    updates: list[dict[str, int | str | None]] = []
 
     for defect in defects:
         code = defect["id"]
-        name = defect["name"]
-        part_type = defect.get("part_type")
+        values = (defect["name"], defect.get("part_type"))
 
         incoming_ids.add(code)
 
-        problem = existing.get(code)
-        if problem is None:
-            db.session.add(
-                AoiProblemCode(code=code, name=name, part_type=part_type)
-            )
-            changed = True
+        current = existing.get(code)
+        if current == values:
             continue
 
-        updated = False
-        if problem.name != name:
-            problem.name = name
-            updated = True
-        if problem.part_type != part_type:
-            problem.part_type = part_type
-            updated = True
+        row = {"code": code, "name": values[0], "part_type": values[1]}
+        if current is None:
+            inserts.append(row)
+        else:
+            updates.append(row)
 
-        if updated:
-            changed = True
+    stale_ids = existing.keys() - incoming_ids
+    changed = bool(inserts or updates or stale_ids)
 
-    stale_ids = set(existing.keys()) - incoming_ids
+    # Stale rows go first so their names are free for renamed or new codes.
     if stale_ids:
-        AoiProblemCode.query.filter(AoiProblemCode.code.in_(stale_ids)).delete(
-            synchronize_session=False
+        db.session.execute(
+            delete(AoiProblemCode).where(AoiProblemCode.code.in_(stale_ids))
         )
-        changed = True
+    if updates:
+        db.session.execute(update(AoiProblemCode), updates)
+    if inserts:
+        db.session.execute(insert(AoiProblemCode), inserts)
 
     if changed:
         db.session.commit()
+        invalidate_problem_code_cache()
         current_app.logger.info(
             "AOI problem codes synchronised; %s active entries", len(incoming_ids)
         )
@@ -77,6 +121,24 @@ def ensure_problem_codes() -> None:
         )
 
 
+def invalidate_problem_code_cache() -> None:
+    """Discard the cached problem code list so the next read reloads it."""
+
+    global _PROBLEM_CODE_CACHE, _PROBLEM_CODE_NAMES, _PROBLEM_CODE_DIGEST
+    global _PROBLEM_CODE_VERSION
+
+    _PROBLEM_CODE_CACHE = None
+    _PROBLEM_CODE_NAMES = None
+    _PROBLEM_CODE_DIGEST = None
+    _PROBLEM_CODE_VERSION += 1
+
+
+def get_problem_code_version() -> int:
+    """Return a counter that changes whenever the problem codes change."""
+
+    return _PROBLEM_CODE_VERSION
+
+
 def compute_qty_accepted(qty_inspected: int, qty_rejected: int) -> int:
     """Return the computed accepted quantity ensuring it is never negative."""
 
@@ -87,25 +149,107 @@ def compute_qty_accepted(qty_inspected: int, qty_rejected: int) -> int:
 def find_problem_name(code: int) -> str | None:
     """Return the human-readable name for ``code`` or ``None``."""
 
-    problem = AoiProblemCode.query.get(code)
-    return problem.name if problem else None
+    return _get_problem_code_names().get(code)
+
+
+def _get_problem_code_names() -> dict[int, str]:
+    """Return the cached ``code -> name`` map, loading it when cold."""
+
+    if _PROBLEM_CODE_NAMES is None:
+        get_problem_codes()
+    return _PROBLEM_CODE_NAMES or {}
+
+
+def find_known_problem_codes(codes: Iterable[int]) -> set[int]:
+    """Return the subset of ``codes`` that exist as AOI problem codes.
+
+    Uses the cached problem code list when it is warm; otherwise resolves all
+    candidates with a single ``IN`` query.
+    """
+
+    candidates = set(codes)
+    if not candidates:
+        return set()
+
+    if _PROBLEM_CODE_NAMES is not None:
+        return candidates & _PROBLEM_CODE_NAMES.keys()
+
+    rows = (
+        db.session.query(AoiProblemCode.code)
+        .filter(AoiProblemCode.code.in_(candidates))
+        .all()
+    )
+    return {code for (code,) in rows}
+
+
+# Column rows rather than entities: the cache only keeps plain dictionaries, so
+# hydrating AoiProblemCode instances would be thrown away immediately.
+_PROBLEM_CODE_LIST_QUERY = select(
+    AoiProblemCode.code, AoiProblemCode.name, AoiProblemCode.part_type
+).order_by(AoiProblemCode.code.asc())
 
 
 def get_problem_codes() -> list[dict[str, int | str | None]]:
-    """Return a serialisable list of problem codes for the UI."""
+    """Return a serialisable list of problem codes for the UI.
+
+    The list is built once and served from an in-process cache until
+    :func:`ensure_problem_codes` reports a change. While the table is still
+    empty, the Supabase sync is attempted at most once per app context so a
+    single request never repeats the round trip.
+    """
+
+    global _PROBLEM_CODE_CACHE, _PROBLEM_CODE_NAMES, _PROBLEM_CODE_DIGEST
+
+    if _PROBLEM_CODE_CACHE is None:
+        codes = db.session.execute(_PROBLEM_CODE_LIST_QUERY).mappings().all()
+        if not codes and not g.get("aoi_problem_code_sync_attempted"):
+            ensure_problem_codes()
+            codes = db.session.execute(_PROBLEM_CODE_LIST_QUERY).mappings().all()
+        if not codes:
+            # Nothing to cache yet; retry on the next call once a sync succeeds.
+            return []
+        _PROBLEM_CODE_CACHE = [dict(code) for code in codes]
+        _PROBLEM_CODE_NAMES = {code["code"]: code["name"] for code in codes}
+        _PROBLEM_CODE_DIGEST = hashlib.sha1(
+            json.dumps(_PROBLEM_CODE_CACHE, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+    return list(_PROBLEM_CODE_CACHE)
 
-    codes = AoiProblemCode.query.order_by(AoiProblemCode.code.asc()).all()
-    if not codes:
-        ensure_problem_codes()
-        codes = AoiProblemCode.query.order_by(AoiProblemCode.code.asc()).all()
-    return [code.to_dict() for code in codes]
+
+def get_problem_code_etag() -> str:
+    """Return an entity tag for the list last returned by :func:`get_problem_codes`.
+
+    The tag is derived from the cached list's content rather than the
+    per-process version counter so every worker agrees on it.
+    """
+
+    return f"pc-{_PROBLEM_CODE_DIGEST or 'empty'}"
 
 
 def get_known_inspectors() -> list[str]:
     """Return usernames that can be used as inspector selections."""
 
-    inspectors = [user.username for user in User.query.order_by(User.username.asc())]
-    return inspectors
+    global _INSPECTORS_CACHE
+
+    now = time.monotonic()
+    if _INSPECTORS_CACHE is not None and now - _INSPECTORS_CACHE[0] < _INSPECTORS_CACHE_TTL:
+        return list(_INSPECTORS_CACHE[1])
+
+    from ..models import User
+
+    inspectors = db.session.scalars(
+        select(User.username).order_by(User.username.asc())
+    ).all()
+    _INSPECTORS_CACHE = (now, inspectors)
+    return list(inspectors)
+
+
+def clear_inspectors_cache() -> None:
+    """Forget cached inspector usernames after the user roster changes."""
+
+    global _INSPECTORS_CACHE
+
+    _INSPECTORS_CACHE = None
 
 
 class ValidationError(Exception):
@@ -116,16 +260,34 @@ class ValidationError(Exception):
         self.errors = errors
 
 
-def _parse_int(value: Any, field: str, min_value: int | None = None) -> int:
-    if value in (None, ""):
+def _coerce_int(value: Any) -> int | None:
+    """Return ``value`` as an ``int`` (blank counts as ``0``) or ``None``.
+
+    Plain ints and decimal strings skip the ``try``/``except`` path, which is
+    the common case for JSON and form payloads.
+    """
+
+    if type(value) is int:
+        return value
+    if value is None or value == "":
         return 0
+    if type(value) is str and value.isdecimal():
+        return int(value)
     try:
-        parsed = int(value)
-    except (TypeError, ValueError) as exc:  # pragma: no cover - protective branch
-        raise ValidationError({field: "Must be an integer"}) from exc
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_int(value: Any, min_value: int | None = None) -> tuple[int, str | None]:
+    """Return ``(value, error)`` so callers can accumulate errors without raising."""
+
+    parsed = _coerce_int(value)
+    if parsed is None:
+        return 0, "Must be an integer"
     if min_value is not None and parsed < min_value:
-        raise ValidationError({field: f"Must be >= {min_value}"})
-    return parsed
+        return 0, f"Must be >= {min_value}"
+    return parsed, None
 
 
 def _parse_date(value: Any, field: str) -> date:
@@ -149,7 +311,7 @@ def normalise_payload(data: dict[str, Any]) -> dict[str, Any]:
     lot = data.get("lot_result", {})
 
     status_value = data.get("status", "submitted")
-    if status_value not in {"draft", "submitted"}:
+    if status_value not in _VALID_STATUSES:
         errors["status"] = "Status must be 'draft' or 'submitted'"
 
     record: dict[str, Any] = {
@@ -177,18 +339,21 @@ def normalise_payload(data: dict[str, Any]) -> dict[str, Any]:
         errors.update(err.errors)
 
     type_value = header.get("type")
-    if type_value not in {"SMT", "TH"}:
+    if type_value not in _VALID_TYPES:
         errors["type"] = "Type must be either 'SMT' or 'TH'"
     else:
         record["type"] = type_value
 
-    try:
-        record["panels_count"] = _parse_int(job.get("panels_count"), "panels_count", 0)
-        record["boards_count"] = _parse_int(job.get("boards_count"), "boards_count", 0)
-        record["qty_inspected"] = _parse_int(lot.get("qty_inspected"), "qty_inspected", 0)
-        record["qty_rejected"] = _parse_int(lot.get("qty_rejected"), "qty_rejected", 0)
-    except ValidationError as err:
-        errors.update(err.errors)
+    for field, source in (
+        ("panels_count", job),
+        ("boards_count", job),
+        ("qty_inspected", lot),
+        ("qty_rejected", lot),
+    ):
+        value, error = _parse_int(source.get(field), 0)
+        if error:
+            errors[field] = error
+        record[field] = value
 
     if record["qty_rejected"] > record["qty_inspected"]:
         errors["qty_rejected"] = "Rejected cannot exceed inspected"
@@ -201,27 +366,76 @@ def normalise_payload(data: dict[str, Any]) -> dict[str, Any]:
     rejections: list[dict[str, Any]] = []
     rejection_errors: list[dict[str, Any]] = []
 
+    parsed_rejections: list[tuple[dict[str, Any], int | None, int | None, dict[str, Any]]] = []
+
     for index, item in enumerate(rejections_input):
         row_errors: dict[str, Any] = {}
         quantity = item.get("quantity")
         problem_code = item.get("problem_code")
 
-        try:
-            quantity_value = _parse_int(quantity, f"rejections[{index}].quantity", 1)
-        except ValidationError as err:
-            row_errors.update(err.errors)
+        quantity_value, quantity_error = _parse_int(quantity, 1)
+        if quantity_error:
+            row_errors[f"rejections[{index}].quantity"] = quantity_error
             quantity_value = None
 
         if problem_code is None:
             row_errors["problem_code"] = "Problem code is required"
-        else:
+        elif type(problem_code) is not int:
             try:
                 problem_code = int(problem_code)
             except (TypeError, ValueError):
                 row_errors["problem_code"] = "Problem code must be a number"
-            else:
-                if find_problem_name(problem_code) is None:
-                    row_errors["problem_code"] = "Unknown problem code"
+                problem_code = None
+
+        parsed_rejections.append((item, quantity_value, problem_code, row_errors))
+
+    board_data_input = data.get("board_data", [])
+    board_rows: list[dict[str, Any]] = []
+    board_errors: list[dict[str, Any]] = []
+
+    parsed_board_rows: list[tuple[dict[str, Any], dict[str, Any]]] = []
+    for item in board_data_input:
+        board_id = (item.get("board_id") or "").strip() or None
+        reference_designators = (item.get("reference_designators") or "").strip() or None
+        board_problem_code = item.get("problem_code") or None
+        board_comments = (item.get("comments") or "").strip() or None
+        if (
+            board_id is None
+            and reference_designators is None
+            and board_problem_code is None
+            and board_comments is None
+        ):
+            continue
+
+        row_errors: dict[str, Any] = {}
+        if board_problem_code is not None and type(board_problem_code) is not int:
+            try:
+                board_problem_code = int(board_problem_code)
+            except (TypeError, ValueError):
+                row_errors["problem_code"] = "Problem code must be a number"
+                board_problem_code = None
+
+        parsed_board_rows.append(
+            (
+                {
+                    "board_id": board_id,
+                    "reference_designators": reference_designators,
+                    "problem_code": board_problem_code,
+                    "comments": board_comments,
+                },
+                row_errors,
+            )
+        )
+
+    # One lookup covers the codes referenced by both rejections and board rows.
+    known_codes = find_known_problem_codes(
+        {code for _, _, code, _ in parsed_rejections if code is not None}
+        | {row["problem_code"] for row, _ in parsed_board_rows if row["problem_code"] is not None}
+    )
+
+    for item, quantity_value, problem_code, row_errors in parsed_rejections:
+        if problem_code is not None and problem_code not in known_codes:
+            row_errors["problem_code"] = "Unknown problem code"
 
         if row_errors:
             rejection_errors.append(row_errors)
@@ -235,23 +449,20 @@ def normalise_payload(data: dict[str, Any]) -> dict[str, Any]:
             }
         )
 
-    board_data_input = data.get("board_data", [])
-    board_rows: list[dict[str, Any]] = []
-    for item in board_data_input:
-        if not any(item.values()):
+    for row, row_errors in parsed_board_rows:
+        if row["problem_code"] is not None and row["problem_code"] not in known_codes:
+            row_errors["problem_code"] = "Unknown problem code"
+
+        if row_errors:
+            board_errors.append(row_errors)
             continue
-        board_rows.append(
-            {
-                "board_id": (item.get("board_id") or "").strip() or None,
-                "reference_designators": (item.get("reference_designators") or "").strip()
-                or None,
-                "problem_code": int(item["problem_code"]) if item.get("problem_code") else None,
-                "comments": (item.get("comments") or "").strip() or None,
-            }
-        )
+
+        board_rows.append(row)
 
     if rejection_errors:
         errors["rejections"] = rejection_errors
+    if board_errors:
+        errors["board_data"] = board_errors
 
     if errors:
         raise ValidationError(errors)
@@ -261,58 +472,156 @@ def normalise_payload(data: dict[str, Any]) -> dict[str, Any]:
     return record
 
 
-def create_form(payload: dict[str, Any]) -> AoiForm:
-    """Persist a new AOI form using ``payload`` data."""
+# Loader options that fetch a form together with its line items and their
+# problem codes so serialisation and templates never trigger lazy loads. Any
+# other relationship raises instead of silently issuing a per-row SELECT.
+FORM_DETAIL_OPTIONS = (
+    selectinload(AoiForm.rejections).joinedload(AoiRejection.problem),
+    selectinload(AoiForm.board_data).joinedload(AoiBoardData.problem),
+    raiseload("*"),
+)
 
-    record = normalise_payload(payload)
 
-    form = AoiForm(
-        date=record["date"],
-        type=record["type"],
-        form_number=record["form_number"],
-        form_rev=record["form_rev"],
-        customer=record.get("customer"),
-        assembly=record.get("assembly"),
-        job_number=record.get("job_number"),
-        revision=record.get("revision"),
-        panels_count=record.get("panels_count"),
-        boards_count=record.get("boards_count"),
-        inspector=record.get("inspector"),
-        qty_inspected=record["qty_inspected"],
-        qty_rejected=record["qty_rejected"],
-        qty_accepted=record["qty_accepted"],
-        comments=record.get("comments"),
-        status=record.get("status", "submitted"),
+def load_form(form_id: uuid.UUID) -> AoiForm | None:
+    """Return the form identified by ``form_id`` with its details eager-loaded."""
+
+    return db.session.get(
+        AoiForm, form_id, options=FORM_DETAIL_OPTIONS, populate_existing=True
     )
 
-    for rejection in record["rejections"]:
-        form.rejections.append(
-            AoiRejection(
-                quantity=rejection["quantity"],
-                problem_code=rejection["problem_code"],
-                reference_designators=rejection.get("reference_designators"),
-            )
-        )
 
-    for board_row in record["board_data"]:
-        form.board_data.append(
-            AoiBoardData(
-                board_id=board_row.get("board_id"),
-                reference_designators=board_row.get("reference_designators"),
-                problem_code=board_row.get("problem_code"),
-                comments=board_row.get("comments"),
-            )
-        )
+def create_form(payload: dict[str, Any]) -> AoiForm:
+    """Persist a new AOI form using ``payload`` data.
+
+    The returned form is detached, with its line items populated from the rows
+    just written; use :func:`load_form` for an instance bound to the session.
+    """
 
-    db.session.add(form)
+    record = normalise_payload(payload)
+
+    # Validation may have opened a read-only transaction for the problem code
+    # lookup; end it so the connection is only held for the write below.
     db.session.commit()
 
+    with db.session.begin():
+        form = AoiForm(
+            date=record["date"],
+            type=record["type"],
+            form_number=record["form_number"],
+            form_rev=record["form_rev"],
+            customer=record.get("customer"),
+            assembly=record.get("assembly"),
+            job_number=record.get("job_number"),
+            revision=record.get("revision"),
+            panels_count=record.get("panels_count"),
+            boards_count=record.get("boards_count"),
+            inspector=record.get("inspector"),
+            qty_inspected=record["qty_inspected"],
+            qty_rejected=record["qty_rejected"],
+            qty_accepted=record["qty_accepted"],
+            comments=record.get("comments"),
+            status=record.get("status", "submitted"),
+        )
+
+        db.session.add(form)
+        db.session.flush()
+
+        rejection_rows = [
+            {
+                "id": uuid.uuid4(),
+                "form_id": form.id,
+                "position": position,
+                "quantity": rejection["quantity"],
+                "problem_code": rejection["problem_code"],
+                "reference_designators": rejection.get("reference_designators"),
+            }
+            for position, rejection in enumerate(record["rejections"])
+        ]
+        board_rows = [
+            {
+                "id": uuid.uuid4(),
+                "form_id": form.id,
+                "position": position,
+                "board_id": board_row.get("board_id"),
+                "reference_designators": board_row.get("reference_designators"),
+                "problem_code": board_row.get("problem_code"),
+                "comments": board_row.get("comments"),
+            }
+            for position, board_row in enumerate(record["board_data"])
+        ]
+
+        # Line items are written with executemany-style bulk inserts rather than
+        # one unit-of-work INSERT per appended child.
+        if rejection_rows:
+            db.session.execute(insert(AoiRejection), rejection_rows)
+        if board_rows:
+            db.session.execute(insert(AoiBoardData), board_rows)
+
+        # Every column value is known once flushed, so detach the form before
+        # the commit expires it rather than reloading it and its line items.
+        db.session.expunge(form)
+
+    set_committed_value(
+        form, "rejections", [AoiRejection(**row) for row in rejection_rows]
+    )
+    set_committed_value(form, "board_data", [AoiBoardData(**row) for row in board_rows])
     return form
 
 
+_REJECTION_FIELDS = attrgetter("id", "quantity", "problem_code", "reference_designators")
+_BOARD_FIELDS = attrgetter("id", "board_id", "reference_designators", "problem_code", "comments")
+
+
 def serialize_form(form: AoiForm) -> dict[str, Any]:
     """Return a JSON-serialisable representation of ``form``."""
 
+    # Names come from the cached problem code map rather than the ``problem``
+    # relationships so lazily loaded forms do not issue a SELECT per row.
+    return _serialize_form(
+        form, form.rejections, form.board_data, _get_problem_code_names()
+    )
+
+
+def _serialize_form(
+    form: AoiForm,
+    form_rejections: Iterable[AoiRejection],
+    form_board_data: Iterable[AoiBoardData],
+    problem_names: dict[int, str],
+) -> dict[str, Any]:
+    rejections: list[dict[str, Any]] = []
+    for rejection in form_rejections:
+        rejection_id, quantity, problem_code, reference_designators = _REJECTION_FIELDS(
+            rejection
+        )
+        rejections.append(
+            {
+                "id": str(rejection_id),
+                "quantity": quantity,
+                "problem_code": problem_code,
+                "problem_name": problem_names.get(problem_code),
+                "reference_designators": reference_designators,
+            }
+        )
+
+    board_data: list[dict[str, Any]] = []
+    for board in form_board_data:
+        board_row_id, board_id, reference_designators, problem_code, comments = _BOARD_FIELDS(
+            board
+        )
+        board_data.append(
+            {
+                "id": str(board_row_id),
+                "board_id": board_id,
+                "reference_designators": reference_designators,
+                "problem_code": problem_code,
+                "problem_name": problem_names.get(problem_code),
+                "comments": comments,
+            }
+        )
+
+    created_at = form.created_at
+    updated_at = form.updated_at
+
     return {
         "id": str(form.id),
         "form_number": form.form_number,
@@ -331,33 +640,55 @@ def serialize_form(form: AoiForm) -> dict[str, Any]:
         "qty_accepted": form.qty_accepted,
         "comments": form.comments,
         "status": form.status,
-        "created_at": form.created_at.isoformat() if form.created_at else None,
-        "updated_at": form.updated_at.isoformat() if form.updated_at else None,
-        "rejections": [
-            {
-                "id": str(rejection.id),
-                "quantity": rejection.quantity,
-                "problem_code": rejection.problem_code,
-                "problem_name": rejection.problem.name,
-                "reference_designators": rejection.reference_designators,
-            }
-            for rejection in form.rejections
-        ],
-        "board_data": [
-            {
-                "id": str(board.id),
-                "board_id": board.board_id,
-                "reference_designators": board.reference_designators,
-                "problem_code": board.problem_code,
-                "problem_name": board.problem.name if board.problem else None,
-                "comments": board.comments,
-            }
-            for board in form.board_data
-        ],
+        "created_at": created_at.isoformat() if created_at else None,
+        "updated_at": updated_at.isoformat() if updated_at else None,
+        "rejections": rejections,
+        "board_data": board_data,
     }
 
 
 def serialize_forms(forms: Iterable[AoiForm]) -> list[dict[str, Any]]:
-    """Return a list of serialised form payloads."""
+    """Return a list of serialised form payloads.
+
+    Child rows for every form are fetched with one query per collection and
+    bucketed by ``form_id`` instead of lazily loading each form in turn.
+    """
 
-    return [serialize_form(form) for form in forms]
+    forms = list(forms)
+    if not forms:
+        return []
+
+    form_ids = [form.id for form in forms]
+    rejections_by_form: dict[uuid.UUID, list[AoiRejection]] = {
+        form_id: [] for form_id in form_ids
+    }
+    board_data_by_form: dict[uuid.UUID, list[AoiBoardData]] = {
+        form_id: [] for form_id in form_ids
+    }
+
+    rejection_rows = db.session.scalars(
+        select(AoiRejection)
+        .where(AoiRejection.form_id.in_(form_ids))
+        .order_by(AoiRejection.position, AoiRejection.id)
+    )
+    for rejection in rejection_rows:
+        rejections_by_form[rejection.form_id].append(rejection)
+
+    board_rows = db.session.scalars(
+        select(AoiBoardData)
+        .where(AoiBoardData.form_id.in_(form_ids))
+        .order_by(AoiBoardData.position, AoiBoardData.id)
+    )
+    for board in board_rows:
+        board_data_by_form[board.form_id].append(board)
+
+    problem_names = _get_problem_code_names()
+    return [
+        _serialize_form(
+            form,
+            rejections_by_form[form.id],
+            board_data_by_form[form.id],
+            problem_names,
+        )
+        for form in forms
+    ]
@@ -17,6 +17,34 @@ def _int_from_env(name: str, default: int) -> int:
         return default
 
 
+# Gunicorn's worker thread count when ``GUNICORN_THREADS`` is unset; keep in
+# step with gunicorn.conf.py.
+_DEFAULT_GUNICORN_THREADS = 8
+
+
+def _engine_options_for(database_uri: str) -> dict[str, object]:
+    """Return SQLAlchemy engine options suited to ``database_uri``.
+
+    SQLite relies on SQLAlchemy's file and singleton pools, which do not accept
+    queue pool sizing, so only server databases receive the pooled settings.
+    The pool is per Gunicorn worker, so it defaults to one connection per
+    worker thread plus a small overflow; the server's connection limit must
+    cover ``workers * (pool_size + max_overflow)``.
+    """
+
+    if database_uri.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": _int_from_env(
+            "DB_POOL_SIZE", _int_from_env("GUNICORN_THREADS", _DEFAULT_GUNICORN_THREADS)
+        ),
+        "max_overflow": _int_from_env("DB_MAX_OVERFLOW", 2),
+        "pool_pre_ping": True,
+        "pool_recycle": _int_from_env("DB_POOL_RECYCLE", 3600),
+        "pool_timeout": _int_from_env("DB_POOL_TIMEOUT", 30),
+    }
+
+
 class Config:
     """Base configuration."""
 
@@ -25,7 +53,12 @@ class Config:
         os.environ.get("DATABASE_URL")
         or f"sqlite:///{Path(os.environ.get('FLASK_INSTANCE_PATH', 'instance')).absolute() / 'app.db'}"
     )
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options_for(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SUPABASE_URL = os.environ.get("SUPABASE_URL")
     SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
     SUPABASE_TIMEOUT = _int_from_env("SUPABASE_TIMEOUT", 10)
+    SUPABASE_DEFECTS_TTL = _int_from_env("SUPABASE_DEFECTS_TTL", 300)
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+    SESSION_EVENT_BATCH_SIZE = _int_from_env("SESSION_EVENT_BATCH_SIZE", 200)
+    SESSION_EVENT_FLUSH_MS = _int_from_env("SESSION_EVENT_FLUSH_MS", 100)
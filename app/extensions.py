@@ -2,4 +2,6 @@
 from flask_sqlalchemy import SQLAlchemy
 
 
-db = SQLAlchemy()
+# Request-scoped sessions end right after their commit, so expiring every
+# instance on commit would only force reloads of rows the request already has.
+db = SQLAlchemy(session_options={"expire_on_commit": False})
@@ -0,0 +1,68 @@
+"""JSON provider that serialises responses with :mod:`orjson`."""
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependency optional
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(value: Any) -> Any:
+    """Serialise the extra types Flask's default provider understands."""
+
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class OrjsonJSONProvider(DefaultJSONProvider):
+    """Drop-in provider that encodes and decodes JSON through ``orjson``.
+
+    ``orjson`` natively handles ``datetime``, ``date``, ``UUID`` and dataclass
+    values. Calls that pass stdlib-specific keyword arguments fall back to the
+    default implementation.
+    """
+
+    option = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+    # orjson preserves insertion order; keep the stdlib fallback consistent
+    # unless a caller asks for ``sort_keys`` explicitly.
+    sort_keys = False
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self.option).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Any:
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self.option | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=option), mimetype=self.mimetype
+        )
+
+
+def register_json_provider(app: Any) -> None:
+    """Install :class:`OrjsonJSONProvider` on ``app`` when ``orjson`` is available."""
+
+    if orjson is None:
+        app.logger.debug("orjson is not installed; using the default JSON provider")
+        return
+    app.json = OrjsonJSONProvider(app)
+    # Jinja's ``tojson`` filter passes ``sort_keys=True`` by default, which
+    # sends every call down the stdlib fallback; without kwargs it uses orjson
+    # and keeps insertion order, matching the JSON responses.
+    app.jinja_env.policies["json.dumps_kwargs"] = {}
@@ -1,11 +1,18 @@
 """Database models for the reporting software."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+import time
+import weakref
+from collections.abc import Mapping
 from datetime import datetime
 from enum import Enum
+from types import MappingProxyType
+from typing import Any
 
-from sqlalchemy import inspect, text
+from flask import current_app
+from sqlalchemy import Engine, event, inspect, text
+from sqlalchemy.orm import Mapped, Session
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from .extensions import db
@@ -22,53 +29,82 @@ class Role(str, Enum):
     def label(self) -> str:
         """Return a human-readable label for the role."""
 
-        return {
-            Role.ADMIN: "Administrator",
-            Role.MANAGER: "Manager",
-            Role.STAFF: "User",
-        }[self]
+        return _ROLE_LABELS[self]
+
+
+_ROLE_LABELS = MappingProxyType(
+    {
+        Role.ADMIN: "Administrator",
+        Role.MANAGER: "Manager",
+        Role.STAFF: "User",
+    }
+)
+# Stored role strings mapped back to ``Role`` members.
+ROLE_BY_VALUE = MappingProxyType({role.value: role for role in Role})
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """Return whether ``password`` matches the stored ``password_hash``."""
+
+    return check_password_hash(password_hash, password)
 
 
-@dataclass
 class User(db.Model):
     """Represents an authenticated user."""
 
-    id: int = db.Column(db.Integer, primary_key=True)
-    username: str = db.Column(db.String(64), unique=True, nullable=False)
-    password_hash: str = db.Column(db.String(255), nullable=False)
-    role: str = db.Column(db.String(32), nullable=False, default=Role.STAFF.value)
+    id: Mapped[int] = db.Column(db.Integer, primary_key=True)
+    username: Mapped[str] = db.Column(db.String(64), unique=True, nullable=False)
+    password_hash: Mapped[str] = db.Column(db.String(255), nullable=False)
+    role: Mapped[str] = db.Column(
+        db.String(32), nullable=False, default=Role.STAFF.value, index=True
+    )
 
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        method = current_app.config.get("PASSWORD_HASH_METHOD", "scrypt")
+        self.password_hash = generate_password_hash(password, method=method)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
 
     @property
     def role_enum(self) -> Role:
         """Return the role as an enum instance."""
 
-        return Role(self.role)
+        # A plain dict hit for known values; ``Role()`` only runs to raise the
+        # usual ValueError for an unknown stored role.
+        return ROLE_BY_VALUE.get(self.role) or Role(self.role)
+
+
+# Settings are reloaded after this many seconds so changes made by other
+# worker processes are picked up.
+_SETTINGS_CACHE_TTL = 60.0
+_SETTINGS_CACHE: tuple[float, dict[str, str]] | None = None
 
 
-@dataclass
 class ApplicationSetting(db.Model):
     """Represents configurable application-wide settings."""
 
-    key: str = db.Column(db.String(64), primary_key=True)
-    value: str = db.Column(db.String(255), nullable=False)
+    key: Mapped[str] = db.Column(db.String(64), primary_key=True)
+    value: Mapped[str] = db.Column(db.String(255), nullable=False)
 
     @staticmethod
     def get_value(key: str, default: str = "") -> str:
         """Fetch the stored value for ``key`` or return ``default``."""
 
-        setting = ApplicationSetting.query.filter_by(key=key).first()
-        return setting.value if setting else default
+        return _load_settings().get(key, default)
+
+    @staticmethod
+    def get_many(defaults: Mapping[str, str]) -> dict[str, str]:
+        """Return the stored value for each key of ``defaults``, falling back to its default."""
+
+        values = _load_settings()
+        return {key: values.get(key, default) for key, default in defaults.items()}
 
     @staticmethod
     def set_value(key: str, value: str) -> None:
         """Persist ``value`` for ``key`` in the database."""
 
+        _mark_settings_changed()
         setting = ApplicationSetting.query.filter_by(key=key).first()
         if setting is None:
             setting = ApplicationSetting(key=key, value=value)
@@ -76,34 +112,113 @@ class ApplicationSetting(db.Model):
         else:
             setting.value = value
 
+    @staticmethod
+    def set_many(values: Mapping[str, str]) -> None:
+        """Persist every ``key -> value`` pair in ``values`` with a single upsert."""
+
+        if not values:
+            return
+
+        _mark_settings_changed()
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            for key, value in values.items():
+                ApplicationSetting.set_value(key, value)
+            return
+
+        statement = insert(ApplicationSetting).values(
+            [{"key": key, "value": value} for key, value in values.items()]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[ApplicationSetting.key],
+            set_={"value": statement.excluded.value},
+        )
+        db.session.execute(statement)
+
+
+def _mark_settings_changed() -> None:
+    """Drop the settings cache once the current transaction finishes."""
+
+    # Clearing it straight away would let a concurrent request reload the old
+    # values before this commit and keep them for the whole TTL.
+    db.session.info["settings_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_settings_cache(session: Session) -> None:
+    global _SETTINGS_CACHE
+
+    if session.info.pop("settings_changed", False):
+        _SETTINGS_CACHE = None
+
+
+def _load_settings() -> dict[str, str]:
+    """Return every stored setting, loaded with one query and reused briefly."""
+
+    global _SETTINGS_CACHE
+
+    now = time.monotonic()
+    if _SETTINGS_CACHE is None or now - _SETTINGS_CACHE[0] >= _SETTINGS_CACHE_TTL:
+        values = dict(
+            db.session.query(ApplicationSetting.key, ApplicationSetting.value).all()
+        )
+        _SETTINGS_CACHE = (now, values)
+    return _SETTINGS_CACHE[1]
+
 
-@dataclass
 class EmployeeSubmission(db.Model):
     """Represents operational data submitted by employees."""
 
-    id: int = db.Column(db.Integer, primary_key=True)
-    employee_name: str = db.Column(db.String(120), nullable=False)
-    department: str = db.Column(db.String(120), nullable=False)
-    metric_name: str = db.Column(db.String(120), nullable=False)
-    value: float = db.Column(db.Float, nullable=False, default=0.0)
-    performance_score: float = db.Column(db.Float, nullable=False, default=0.0)
-    status: str = db.Column(db.String(64), nullable=False, default="On Track")
-    submitted_at: datetime = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    id: Mapped[int] = db.Column(db.Integer, primary_key=True)
+    employee_name: Mapped[str] = db.Column(db.String(120), nullable=False)
+    department: Mapped[str] = db.Column(db.String(120), nullable=False)
+    metric_name: Mapped[str] = db.Column(db.String(120), nullable=False)
+    value: Mapped[float] = db.Column(db.Float, nullable=False, default=0.0)
+    performance_score: Mapped[float] = db.Column(db.Float, nullable=False, default=0.0)
+    status: Mapped[str] = db.Column(db.String(64), nullable=False, default="On Track")
+    submitted_at: Mapped[datetime] = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Covering indexes for the analysis view: each GROUP BY and the recent
+    # entries listing can be answered from an index instead of a table scan.
+    __table_args__ = (
+        db.Index("ix_employee_submission_department_score", "department", "performance_score"),
+        db.Index(
+            "ix_employee_submission_employee_score_value",
+            "employee_name",
+            "performance_score",
+            "value",
+        ),
+        db.Index("ix_employee_submission_submitted_at", "submitted_at"),
+    )
 
 
-@dataclass
 class SessionEvent(db.Model):
     """Audit trail of user interactions within a signed-in session."""
 
-    id: int = db.Column(db.Integer, primary_key=True)
-    session_id: str = db.Column(db.String(64), nullable=False, index=True)
-    user_id: int | None = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
-    username: str | None = db.Column(db.String(64), nullable=True)
-    event_type: str = db.Column(db.String(64), nullable=False, index=True)
-    context_value: str | None = db.Column(db.String(128), nullable=True, index=True)
-    event_details: str | None = db.Column(db.Text, nullable=True)
-    path: str | None = db.Column(db.String(255), nullable=True)
-    created_at: datetime = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    id: Mapped[int] = db.Column(db.Integer, primary_key=True)
+    session_id: Mapped[str] = db.Column(db.String(64), nullable=False, index=True)
+    user_id: Mapped[int | None] = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
+    username: Mapped[str | None] = db.Column(db.String(64), nullable=True)
+    event_type: Mapped[str] = db.Column(db.String(64), nullable=False)
+    context_value: Mapped[str | None] = db.Column(db.String(128), nullable=True, index=True)
+    # Copied out of ``event_details`` so per-area reporting can GROUP BY in SQL.
+    area: Mapped[str | None] = db.Column(db.String(128), nullable=True, index=True)
+    event_details: Mapped[str | None] = db.Column(db.Text, nullable=True)
+    path: Mapped[str | None] = db.Column(db.String(255), nullable=True)
+    created_at: Mapped[datetime] = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    # The session log groups each event type by context or area; leading with
+    # ``event_type`` lets those aggregates read a single index range.
+    __table_args__ = (
+        db.Index("ix_session_event_type_context", "event_type", "context_value"),
+        db.Index("ix_session_event_type_area", "event_type", "area"),
+    )
 
 
 DEFAULT_USERS: tuple[dict[str, str | Role], ...] = (
@@ -111,43 +226,124 @@ DEFAULT_USERS: tuple[dict[str, str | Role], ...] = (
     {"username": "Schwartz", "password": "2276", "role": Role.ADMIN},
 )
 
+# Engines whose ``user.role`` column and index are already known to exist.
+_ROLE_COLUMN_VERIFIED: weakref.WeakSet[Engine] = weakref.WeakSet()
+
 
 def ensure_user_role_column() -> None:
-    """Ensure the ``role`` column exists on the ``user`` table."""
+    """Ensure the ``role`` column and its index exist on the ``user`` table.
 
-    inspector = inspect(db.engine)
+    The outcome is remembered per engine so reflection runs at most once.
+    """
+
+    engine = db.engine
+    if engine in _ROLE_COLUMN_VERIFIED:
+        return
+
+    inspector = inspect(engine)
     if "user" not in inspector.get_table_names():
         return
 
     columns = {column_info["name"] for column_info in inspector.get_columns("user")}
-    if "role" in columns:
-        return
+    indexes = {index_info["name"] for index_info in inspector.get_indexes("user")}
 
     default_role = Role.STAFF.value
     escaped_default_role = default_role.replace("'", "''")
-    with db.engine.begin() as connection:
-        connection.execute(
-            text(
-                "ALTER TABLE user ADD COLUMN role TEXT NOT NULL DEFAULT "
-                f"'{escaped_default_role}'"
+    with engine.begin() as connection:
+        if "role" not in columns:
+            connection.execute(
+                text(
+                    "ALTER TABLE user ADD COLUMN role TEXT NOT NULL DEFAULT "
+                    f"'{escaped_default_role}'"
+                )
             )
-        )
+            connection.execute(
+                text("UPDATE user SET role = :default_role WHERE role IS NULL OR role = ''"),
+                {"default_role": default_role},
+            )
+        # Databases created before the index was declared still need it for
+        # the administrator-count checks.
+        if "ix_user_role" not in indexes:
+            connection.execute(text("CREATE INDEX ix_user_role ON user (role)"))
+    _ROLE_COLUMN_VERIFIED.add(engine)
+
+
+def ensure_session_event_area_column() -> None:
+    """Add and backfill ``session_event.area`` on databases that predate it."""
+
+    inspector = inspect(db.engine)
+    if "session_event" not in inspector.get_table_names():
+        return
+
+    columns = {column_info["name"] for column_info in inspector.get_columns("session_event")}
+    if "area" in columns:
+        return
+
+    with db.engine.begin() as connection:
+        connection.execute(text("ALTER TABLE session_event ADD COLUMN area VARCHAR(128)"))
         connection.execute(
-            text("UPDATE user SET role = :default_role WHERE role IS NULL OR role = ''"),
-            {"default_role": default_role},
+            text("CREATE INDEX ix_session_event_area ON session_event (area)")
         )
 
+        backfill = []
+        for event_id, event_details in connection.execute(
+            text("SELECT id, event_details FROM session_event WHERE event_details IS NOT NULL")
+        ):
+            area = session_event_area(event_details)
+            if area is not None:
+                backfill.append({"id": event_id, "area": area})
+        if backfill:
+            connection.execute(
+                text("UPDATE session_event SET area = :area WHERE id = :id"), backfill
+            )
+
+
+def session_event_area(event_details: str | dict[str, Any] | None) -> str | None:
+    """Return the normalised ``area`` recorded in ``event_details``, if any."""
+
+    if isinstance(event_details, str):
+        try:
+            event_details = json.loads(event_details)
+        except ValueError:
+            return None
+    if not isinstance(event_details, dict):
+        return None
+    area = str(event_details.get("area") or "").strip()
+    return area[:128] or None
+
+
+def ensure_declared_indexes() -> None:
+    """Create any model index missing from tables that already existed.
+
+    ``create_all`` skips existing tables entirely, so indexes added to a model
+    later would otherwise never reach older databases.
+    """
+
+    engine = db.engine
+    existing_tables = set(inspect(engine).get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
 
 def ensure_default_user() -> None:
     """Ensure the default user roster exists and has the correct roles."""
 
+    usernames = [str(default_user["username"]) for default_user in DEFAULT_USERS]
+    existing = {
+        user.username: user
+        for user in User.query.filter(User.username.in_(usernames)).all()
+    }
+
     changed = False
     for default_user in DEFAULT_USERS:
         username = str(default_user["username"])
         password = str(default_user["password"])
         role = Role(default_user["role"])
 
-        user = User.query.filter_by(username=username).first()
+        user = existing.get(username)
         if user is None:
             user = User(username=username, role=role.value)
             user.set_password(password)
@@ -1,16 +1,18 @@
 """Authentication and administration routes."""
 from __future__ import annotations
 
-import json
-
-from collections.abc import Iterable
+from collections.abc import Callable, Collection, Mapping
 from datetime import date
+from functools import wraps
+from types import MappingProxyType
 from typing import Any
 from uuid import uuid4
 
 from flask import (
     Blueprint,
+    current_app,
     flash,
+    g,
     jsonify,
     redirect,
     render_template,
@@ -18,14 +20,80 @@ from flask import (
     session,
     url_for,
 )
-from sqlalchemy import func
+from sqlalchemy import Row, bindparam, case, delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
 
+from ..aoi.service import clear_inspectors_cache
 from ..extensions import db
-from ..models import ApplicationSetting, EmployeeSubmission, Role, SessionEvent, User
+from ..services.session_events import flush_session_events, queue_session_event
+from ..models import (
+    ROLE_BY_VALUE,
+    ApplicationSetting,
+    EmployeeSubmission,
+    Role,
+    SessionEvent,
+    User,
+    session_event_area,
+    verify_password,
+)
 
 
 auth_bp = Blueprint("auth", __name__)
 
+# Values shown on the settings page until an administrator saves their own.
+SETTINGS_DEFAULTS = MappingProxyType(
+    {
+        "application_name": "Reporting Software",
+        "tagline": "Executive Insights Platform",
+        "data_source": "sqlite:///instance/app.db",
+        "warehouse_connection": "Not configured",
+        "refresh_interval": "Hourly",
+        "analysis_focus": "Quality & Throughput",
+    }
+)
+
+# Role lookups handed to templates; ``Role`` is immutable, so build them once.
+ROLE_LABELS = MappingProxyType({role.value: role.label for role in Role})
+ROLES = tuple(Role)
+
+# Roles allowed into the administrator views and analysis mode.
+ADMIN_ROLES = frozenset({Role.ADMIN.value})
+ANALYSIS_ROLES = frozenset({Role.ADMIN.value, Role.MANAGER.value})
+
+# Subset of the settings summarised on the analysis page.
+ANALYSIS_SETTING_DEFAULTS = MappingProxyType(
+    {
+        key: SETTINGS_DEFAULTS[key]
+        for key in ("analysis_focus", "data_source", "refresh_interval")
+    }
+)
+
+# Hot lookups built once with bind parameters. SQLAlchemy caches the compiled
+# SQL per statement, so each request only binds values instead of rebuilding
+# and re-keying the select.
+_admin = aliased(User)
+_ADMIN_COUNT = (
+    select(func.count())
+    .select_from(_admin)
+    .where(_admin.role == Role.ADMIN.value)
+    .scalar_subquery()
+)
+USER_WITH_ADMIN_COUNT_QUERY = select(
+    User, case((User.role == Role.ADMIN.value, _ADMIN_COUNT))
+).where(User.id == bindparam("user_id"))
+LOGIN_USER_QUERY = select(User.id, User.username, User.role, User.password_hash).where(
+    User.username == bindparam("username")
+)
+LOGIN_PICKER_QUERY = select(User.id, User.username).order_by(User.username)
+
+
+@auth_bp.context_processor
+def inject_role_helpers() -> dict[str, object]:
+    """Expose the role constants to every auth template."""
+
+    return {"Role": Role, "role_labels": ROLE_LABELS, "roles": ROLES}
+
 
 def ensure_session_token() -> str:
     """Guarantee a stable identifier for the current browser session."""
@@ -44,57 +112,88 @@ def set_progress_banner(details: str, primary: str | None = None) -> None:
     session["progress_details"] = details
 
 
-def derive_banner(
-    event_type: str,
-    details: dict[str, Any] | None,
-    context_value: str | None,
-    user: User | None,
-) -> tuple[str, str] | None:
-    """Translate an interaction into the banner language shown to the user."""
+def _login_banner(
+    username: str, payload: dict[str, Any], context_value: str | None
+) -> tuple[str, str]:
+    return (
+        "Authentication complete",
+        f"{username} is signed in. Double-check that you're using the intended account before continuing.",
+    )
 
-    username = (user.username if user else session.get("username")) or "User"
-    payload = details or {}
 
-    if event_type == "login":
-        return (
-            "Authentication complete",
-            f"{username} is signed in. Double-check that you're using the intended account before continuing.",
-        )
+def _area_selected_banner(
+    username: str, payload: dict[str, Any], context_value: str | None
+) -> tuple[str, str]:
+    area = payload.get("area") or context_value or "an area"
+    return (
+        "Area confirmation",
+        f"{username} selected {area}. Confirm this is where you need to work before moving forward.",
+    )
 
-    if event_type == "area_selected":
-        area = payload.get("area") or context_value or "an area"
-        return (
-            "Area confirmation",
-            f"{username} selected {area}. Confirm this is where you need to work before moving forward.",
-        )
 
-    if event_type == "report_selected":
-        report_label = payload.get("report") or context_value or "a report"
-        return (
-            "Report confirmation",
-            f"{username} chose {report_label}. Make sure this is the report you expect before proceeding.",
-        )
+def _report_selected_banner(
+    username: str, payload: dict[str, Any], context_value: str | None
+) -> tuple[str, str]:
+    report_label = payload.get("report") or context_value or "a report"
+    return (
+        "Report confirmation",
+        f"{username} chose {report_label}. Make sure this is the report you expect before proceeding.",
+    )
 
-    if event_type == "return_to_area_selection":
-        area = payload.get("area") or context_value
-        if area:
-            message = (
-                f"{username} returned after reviewing {area}. Use this step to reassess your selection before continuing."
-            )
-        else:
-            message = (
-                f"{username} moved back a step. Review the available areas carefully before continuing."
-            )
-        return ("Navigation update", message)
 
-    if event_type == "view_report":
-        report_label = payload.get("report") or context_value or "the selected report"
-        return (
-            "Report in progress",
-            f"{username} is viewing {report_label}. Validate that the displayed information matches your intent.",
+def _return_to_area_selection_banner(
+    username: str, payload: dict[str, Any], context_value: str | None
+) -> tuple[str, str]:
+    area = payload.get("area") or context_value
+    if area:
+        message = (
+            f"{username} returned after reviewing {area}. Use this step to reassess your selection before continuing."
         )
+    else:
+        message = (
+            f"{username} moved back a step. Review the available areas carefully before continuing."
+        )
+    return ("Navigation update", message)
+
+
+def _view_report_banner(
+    username: str, payload: dict[str, Any], context_value: str | None
+) -> tuple[str, str]:
+    report_label = payload.get("report") or context_value or "the selected report"
+    return (
+        "Report in progress",
+        f"{username} is viewing {report_label}. Validate that the displayed information matches your intent.",
+    )
+
 
-    return None
+# Banner builders keyed by event type; events without an entry show no banner.
+BANNER_BUILDERS: Mapping[
+    str, Callable[[str, dict[str, Any], str | None], tuple[str, str]]
+] = MappingProxyType(
+    {
+        "login": _login_banner,
+        "area_selected": _area_selected_banner,
+        "report_selected": _report_selected_banner,
+        "return_to_area_selection": _return_to_area_selection_banner,
+        "view_report": _view_report_banner,
+    }
+)
+
+
+def derive_banner(
+    event_type: str,
+    details: dict[str, Any] | None,
+    context_value: str | None,
+    user: User | Row[Any] | None,
+) -> tuple[str, str] | None:
+    """Translate an interaction into the banner language shown to the user."""
+
+    builder = BANNER_BUILDERS.get(event_type)
+    if builder is None:
+        return None
+
+    username = (user.username if user else session.get("username")) or "User"
+    return builder(username, details or {}, context_value)
 
 
 def record_session_event(
@@ -102,50 +201,78 @@ def record_session_event(
     *,
     details: dict[str, Any] | None = None,
     context_value: str | None = None,
-    user: User | None = None,
-) -> SessionEvent:
-    """Persist an interaction for later administrative analysis."""
+    user: User | Row[Any] | None = None,
+) -> None:
+    """Queue an interaction for later administrative analysis.
+
+    Events are written in batches by the session event writer, so the request
+    does not wait on an INSERT and COMMIT. ``user`` may be a ``User`` or any
+    row exposing ``id`` and ``username``.
+    """
 
     token = ensure_session_token()
     actor = user or get_current_user()
     username = (actor.username if actor else session.get("username")) or None
 
     try:
-        details_payload = json.dumps(details or {})
+        details_payload = current_app.json.dumps(details or {})
     except (TypeError, ValueError):
-        details_payload = json.dumps({"raw": str(details)})
+        details_payload = current_app.json.dumps({"raw": str(details)})
 
-    event = SessionEvent(
-        session_id=token,
-        user_id=actor.id if actor else None,
-        username=username,
-        event_type=event_type,
-        context_value=context_value,
-        event_details=details_payload,
-        path=request.path,
+    queue_session_event(
+        {
+            "session_id": token,
+            "user_id": actor.id if actor else None,
+            "username": username,
+            "event_type": event_type,
+            "context_value": context_value,
+            "area": session_event_area(details),
+            "event_details": details_payload,
+            "path": request.path,
+        }
     )
 
-    db.session.add(event)
-    db.session.commit()
-    return event
-
 
-def load_event_details(event: SessionEvent) -> dict[str, Any]:
+def load_event_details(event: SessionEvent | Row[Any]) -> dict[str, Any]:
     """Return the stored event payload as a dictionary."""
 
     try:
-        return json.loads(event.event_details or "{}")
+        return current_app.json.loads(event.event_details or "{}")
     except (TypeError, ValueError):
         return {"raw": event.event_details or ""}
 
 
 def get_current_user() -> User | None:
-    """Return the currently authenticated user, if any."""
+    """Return the currently authenticated user, if any.
+
+    The result is memoised on :data:`flask.g` so repeated calls within one
+    request do not go back to the session or database.
+    """
+
+    if "current_user" in g:
+        return g.current_user
 
     user_id = session.get("user_id")
-    if user_id is None:
-        return None
-    return db.session.get(User, user_id)
+    user = db.session.get(User, user_id) if user_id is not None else None
+    if user is not None and session.get("role") != user.role:
+        # Keep the session's copy in step with role changes made after login.
+        session["role"] = user.role
+    g.current_user = user
+    return user
+
+
+def get_user_with_admin_count(user_id: int) -> tuple[User | None, int | None]:
+    """Return the user with ``user_id`` and, for administrators, the admin count.
+
+    Both come from one query. The count is wrapped in a ``CASE`` on the target's
+    role, so the aggregate only runs when the target is an administrator; for
+    other users the count is ``None``.
+    """
+
+    row = db.session.execute(USER_WITH_ADMIN_COUNT_QUERY, {"user_id": user_id}).first()
+    if row is None:
+        return None, None
+    return row[0], row[1]
 
 
 def ensure_logged_in() -> User | None:
@@ -157,14 +284,44 @@ def ensure_logged_in() -> User | None:
     return user
 
 
-def role_allowed(user_role: str, allowed_roles: Iterable[Role]) -> bool:
-    """Return whether the provided role string matches the allowed list."""
+def role_allowed(user_role: str, allowed_roles: Collection[str]) -> bool:
+    """Return whether the provided role string is in ``allowed_roles``.
 
-    try:
-        role_enum = Role(user_role)
-    except ValueError:
-        return False
-    return role_enum in set(allowed_roles)
+    ``Role`` is a ``str`` enum, so members and their values compare equal and a
+    precomputed frozenset such as ``ANALYSIS_ROLES`` gives an O(1) check.
+    """
+
+    return user_role in allowed_roles
+
+
+def require_roles(
+    allowed_roles: Collection[str], denied_message: str, event_type: str | None = None
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Restrict a view to signed-in users whose role is in ``allowed_roles``.
+
+    The wrapped view receives the signed-in user as its first argument, and
+    ``event_type`` (when given) is recorded before it runs. The check always
+    uses the stored role rather than ``session["role"]``, which was captured at
+    login and misses later promotions and demotions.
+    """
+
+    def decorator(view: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            user = ensure_logged_in()
+            if user is None:
+                return redirect(url_for("auth.login"))
+            if not role_allowed(user.role, allowed_roles):
+                flash(denied_message, "error")
+                return redirect(url_for("auth.dashboard"))
+
+            if event_type is not None:
+                record_session_event(event_type, user=user)
+            return view(user, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
 
 
 @auth_bp.route("/", methods=["GET", "POST"])
@@ -172,14 +329,14 @@ def role_allowed(user_role: str, allowed_roles: Iterable[Role]) -> bool:
 def login() -> Any:
     """Render the login form and handle submissions."""
 
-    users = User.query.order_by(User.username).all()
-
     if request.method == "POST":
         username = request.form.get("username", "").strip()
         password = request.form.get("password", "")
 
-        user = User.query.filter_by(username=username).first()
-        if user and user.check_password(password):
+        # Only the columns needed to verify and start the session; the unique
+        # constraint on ``username`` makes this a single index lookup.
+        user = db.session.execute(LOGIN_USER_QUERY, {"username": username}).first()
+        if user and verify_password(user.password_hash, password):
             session["user_id"] = user.id
             session["username"] = user.username
             session["role"] = user.role
@@ -194,6 +351,9 @@ def login() -> Any:
 
         flash("Invalid username or password.", "error")
 
+    # Only the columns the username picker needs; successful logins redirect
+    # before this query runs.
+    users = db.session.execute(LOGIN_PICKER_QUERY).all()
     return render_template("auth/login.html", users=users)
 
 
@@ -207,7 +367,7 @@ def dashboard() -> Any:
 
     is_admin = user.role_enum is Role.ADMIN
     is_staff = user.role_enum is Role.STAFF
-    analysis_access = role_allowed(user.role, {Role.ADMIN, Role.MANAGER})
+    analysis_access = role_allowed(user.role, ANALYSIS_ROLES)
 
     record_session_event(
         "view_dashboard",
@@ -225,22 +385,23 @@ def dashboard() -> Any:
     )
 
 
-@auth_bp.route("/reports/aoi/smt")
-def report_aoi_smt() -> Any:
-    """Render the SMT AOI report selection."""
+# Blank rows rendered on the inspection sheets; ranges are immutable, so one
+# object serves every request.
+INSPECTION_SHEET_ROWS = range(1, 11)
 
-    user = ensure_logged_in()
-    if user is None:
-        return redirect(url_for("auth.login"))
 
-    details = {"report": "SMT Data Inspection Sheet", "area": "AOI"}
+def render_inspection_sheet(user: User, report_type: str) -> Any:
+    """Record the report view and render the inspection sheet for ``report_type``."""
+
+    page_title = f"{report_type} Data Inspection Sheet"
+    details = {"report": page_title, "area": "AOI"}
     record_session_event(
         "view_report",
         details=details,
-        context_value="SMT Data Inspection Sheet",
+        context_value=page_title,
         user=user,
     )
-    banner = derive_banner("view_report", details, "SMT Data Inspection Sheet", user)
+    banner = derive_banner("view_report", details, page_title, user)
     if banner is not None:
         primary, text = banner
         set_progress_banner(text, primary)
@@ -248,14 +409,24 @@ def report_aoi_smt() -> Any:
     return render_template(
         "auth/report_inspection_sheet.html",
         user=user,
-        page_title="SMT Data Inspection Sheet",
-        report_type="SMT",
+        page_title=page_title,
+        report_type=report_type,
         report_date=date.today(),
-        defect_rows=range(1, 11),
-        rejection_rows=range(1, 11),
+        defect_rows=INSPECTION_SHEET_ROWS,
+        rejection_rows=INSPECTION_SHEET_ROWS,
     )
 
 
+@auth_bp.route("/reports/aoi/smt")
+def report_aoi_smt() -> Any:
+    """Render the SMT AOI report selection."""
+
+    user = ensure_logged_in()
+    if user is None:
+        return redirect(url_for("auth.login"))
+    return render_inspection_sheet(user, "SMT")
+
+
 @auth_bp.route("/reports/aoi/th")
 def report_aoi_th() -> Any:
     """Render the TH AOI report selection."""
@@ -263,28 +434,7 @@ def report_aoi_th() -> Any:
     user = ensure_logged_in()
     if user is None:
         return redirect(url_for("auth.login"))
-
-    details = {"report": "TH Data Inspection Sheet", "area": "AOI"}
-    record_session_event(
-        "view_report",
-        details=details,
-        context_value="TH Data Inspection Sheet",
-        user=user,
-    )
-    banner = derive_banner("view_report", details, "TH Data Inspection Sheet", user)
-    if banner is not None:
-        primary, text = banner
-        set_progress_banner(text, primary)
-
-    return render_template(
-        "auth/report_inspection_sheet.html",
-        user=user,
-        page_title="TH Data Inspection Sheet",
-        report_type="TH",
-        report_date=date.today(),
-        defect_rows=range(1, 11),
-        rejection_rows=range(1, 11),
-    )
+    return render_inspection_sheet(user, "TH")
 
 
 @auth_bp.route("/session/event", methods=["POST"])
@@ -333,167 +483,170 @@ def logout() -> Any:
     if user is not None:
         record_session_event("logout", user=user)
     session.clear()
+    g.pop("current_user", None)
     flash("You have been logged out.", "info")
     return redirect(url_for("auth.login"))
 
 
-@auth_bp.route("/settings", methods=["GET", "POST"])
-def settings() -> Any:
-    """Administrative configuration dashboard for application owners."""
+def _update_general(form: Mapping[str, str], current_user: User) -> tuple[str, str]:
+    application_name = form.get("application_name", "").strip()
+    tagline = form.get("tagline", "").strip()
+    ApplicationSetting.set_many(
+        {
+            "application_name": application_name or SETTINGS_DEFAULTS["application_name"],
+            "tagline": tagline or SETTINGS_DEFAULTS["tagline"],
+        }
+    )
+    db.session.commit()
+    return "General configuration updated.", "success"
 
-    user = ensure_logged_in()
-    if user is None:
-        return redirect(url_for("auth.login"))
 
-    if user.role_enum is not Role.ADMIN:
-        flash("Administrator access is required to view settings.", "error")
-        return redirect(url_for("auth.dashboard"))
+def _update_database(form: Mapping[str, str], current_user: User) -> tuple[str, str]:
+    data_source = form.get("data_source", "").strip()
+    warehouse_connection = form.get("warehouse_connection", "").strip()
+    refresh_interval = (
+        form.get("refresh_interval", "").strip() or SETTINGS_DEFAULTS["refresh_interval"]
+    )
 
-    record_session_event("view_settings", user=user)
+    ApplicationSetting.set_many(
+        {
+            "data_source": data_source or SETTINGS_DEFAULTS["data_source"],
+            "warehouse_connection": warehouse_connection
+            or SETTINGS_DEFAULTS["warehouse_connection"],
+            "refresh_interval": refresh_interval,
+        }
+    )
+    db.session.commit()
+    return "Database connectivity preferences saved.", "success"
 
-    settings_defaults = {
-        "application_name": "Reporting Software",
-        "tagline": "Executive Insights Platform",
-        "data_source": "sqlite:///instance/app.db",
-        "warehouse_connection": "Not configured",
-        "refresh_interval": "Hourly",
-        "analysis_focus": "Quality & Throughput",
-    }
 
-    if request.method == "POST":
-        action = request.form.get("action", "").strip()
+def _update_analysis(form: Mapping[str, str], current_user: User) -> tuple[str, str]:
+    analysis_focus = (
+        form.get("analysis_focus", "").strip() or SETTINGS_DEFAULTS["analysis_focus"]
+    )
+    ApplicationSetting.set_many({"analysis_focus": analysis_focus})
+    db.session.commit()
+    return "Analysis mode preferences updated.", "success"
 
-        if action == "update_general":
-            application_name = request.form.get("application_name", "").strip()
-            tagline = request.form.get("tagline", "").strip()
-            ApplicationSetting.set_value(
-                "application_name", application_name or settings_defaults["application_name"]
-            )
-            ApplicationSetting.set_value(
-                "tagline", tagline or settings_defaults["tagline"]
-            )
-            db.session.commit()
-            flash("General configuration updated.", "success")
-
-        elif action == "update_database":
-            data_source = request.form.get("data_source", "").strip()
-            warehouse_connection = request.form.get("warehouse_connection", "").strip()
-            refresh_interval = request.form.get("refresh_interval", "").strip() or settings_defaults[
-                "refresh_interval"
-            ]
-
-            ApplicationSetting.set_value(
-                "data_source", data_source or settings_defaults["data_source"]
-            )
-            ApplicationSetting.set_value(
-                "warehouse_connection",
-                warehouse_connection or settings_defaults["warehouse_connection"],
-            )
-            ApplicationSetting.set_value("refresh_interval", refresh_interval)
-            db.session.commit()
-            flash("Database connectivity preferences saved.", "success")
-
-        elif action == "update_analysis":
-            analysis_focus = request.form.get("analysis_focus", "").strip() or settings_defaults[
-                "analysis_focus"
-            ]
-            ApplicationSetting.set_value("analysis_focus", analysis_focus)
-            db.session.commit()
-            flash("Analysis mode preferences updated.", "success")
-
-        elif action == "add_user":
-            username = request.form.get("new_username", "").strip()
-            password = request.form.get("new_password", "")
-            role_value = request.form.get("new_role", Role.STAFF.value)
-
-            if not username or not password:
-                flash("A username and password are required to create a user.", "error")
-            else:
-                try:
-                    role = Role(role_value)
-                except ValueError:
-                    flash("Invalid role selected.", "error")
-                else:
-                    existing = User.query.filter_by(username=username).first()
-                    if existing is not None:
-                        flash("A user with that username already exists.", "error")
-                    else:
-                        new_user = User(username=username, role=role.value)
-                        new_user.set_password(password)
-                        db.session.add(new_user)
-                        db.session.commit()
-                        flash(f"User '{username}' created successfully.", "success")
-
-        elif action == "update_user_role":
-            target_id = request.form.get("user_id")
-            role_value = request.form.get("role", Role.STAFF.value)
-
-            try:
-                role = Role(role_value)
-            except ValueError:
-                flash("Invalid role selected.", "error")
-            else:
-                if target_id is None:
-                    flash("Unable to identify the user to update.", "error")
-                else:
-                    try:
-                        target_pk = int(target_id)
-                    except (TypeError, ValueError):
-                        flash("Unable to identify the user to update.", "error")
-                    else:
-                        target_user = db.session.get(User, target_pk)
-                        if target_user is None:
-                            flash("The selected user could not be found.", "error")
-                        else:
-                            if (
-                                target_user.role == Role.ADMIN.value
-                                and role is not Role.ADMIN
-                                and User.query.filter_by(role=Role.ADMIN.value).count() <= 1
-                            ):
-                                flash(
-                                    "At least one administrator must remain in the system.",
-                                    "error",
-                                )
-                            else:
-                                target_user.role = role.value
-                                db.session.commit()
-                                flash("User access level updated.", "success")
-
-        elif action == "delete_user":
-            target_id = request.form.get("user_id")
-            if target_id is None:
-                flash("Unable to identify the user to remove.", "error")
-            else:
-                try:
-                    target_pk = int(target_id)
-                except (TypeError, ValueError):
-                    flash("Unable to identify the user to remove.", "error")
-                else:
-                    target_user = db.session.get(User, target_pk)
-                    if target_user is None:
-                        flash("The selected user could not be found.", "error")
-                    elif target_user.id == user.id:
-                        flash("You cannot remove your own account while signed in.", "error")
-                    elif (
-                        target_user.role == Role.ADMIN.value
-                        and User.query.filter_by(role=Role.ADMIN.value).count() <= 1
-                    ):
-                        flash("At least one administrator must remain in the system.", "error")
-                    else:
-                        db.session.delete(target_user)
-                        db.session.commit()
-                        flash(f"User '{target_user.username}' removed.", "success")
 
-        else:
+def _add_user(form: Mapping[str, str], current_user: User) -> tuple[str, str]:
+    username = form.get("new_username", "").strip()
+    password = form.get("new_password", "")
+    role_value = form.get("new_role", Role.STAFF.value)
+
+    if not username or not password:
+        return "A username and password are required to create a user.", "error"
+
+    role = ROLE_BY_VALUE.get(role_value)
+    if role is None:
+        return "Invalid role selected.", "error"
+
+    # The UNIQUE constraint on ``username`` is the duplicate check; it costs no
+    # extra round trip and cannot race with a concurrent insert.
+    new_user = User(username=username, role=role.value)
+    new_user.set_password(password)
+    db.session.add(new_user)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return "A user with that username already exists.", "error"
+    clear_inspectors_cache()
+    return f"User '{username}' created successfully.", "success"
+
+
+def _parse_user_id(value: str | None) -> int | None:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _update_user_role(form: Mapping[str, str], current_user: User) -> tuple[str, str]:
+    role = ROLE_BY_VALUE.get(form.get("role", Role.STAFF.value))
+    if role is None:
+        return "Invalid role selected.", "error"
+
+    target_pk = _parse_user_id(form.get("user_id"))
+    if target_pk is None:
+        return "Unable to identify the user to update.", "error"
+
+    target_user, admin_count = get_user_with_admin_count(target_pk)
+    if target_user is None:
+        return "The selected user could not be found.", "error"
+    if role is not Role.ADMIN and admin_count is not None and admin_count <= 1:
+        return "At least one administrator must remain in the system.", "error"
+
+    target_user.role = role.value
+    db.session.commit()
+    return "User access level updated.", "success"
+
+
+def _delete_user(form: Mapping[str, str], current_user: User) -> tuple[str, str]:
+    target_pk = _parse_user_id(form.get("user_id"))
+    if target_pk is None:
+        return "Unable to identify the user to remove.", "error"
+
+    target_user, admin_count = get_user_with_admin_count(target_pk)
+    if target_user is None:
+        return "The selected user could not be found.", "error"
+    if target_user.id == current_user.id:
+        return "You cannot remove your own account while signed in.", "error"
+    if admin_count is not None and admin_count <= 1:
+        return "At least one administrator must remain in the system.", "error"
+
+    # The guard query above already loaded everything the checks need, and
+    # User has no ORM cascades, so a plain DELETE skips the unit of work.
+    username = target_user.username
+    result = db.session.execute(delete(User).where(User.id == target_pk))
+    if result.rowcount == 0:
+        db.session.rollback()
+        return "The selected user could not be found.", "error"
+    db.session.commit()
+    clear_inspectors_cache()
+    return f"User '{username}' removed.", "success"
+
+
+# ``settings()`` POST handlers keyed by the submitted ``action``. Each returns
+# the flash message and category to show.
+SETTINGS_ACTIONS: Mapping[str, Callable[[Mapping[str, str], User], tuple[str, str]]] = (
+    MappingProxyType(
+        {
+            "update_general": _update_general,
+            "update_database": _update_database,
+            "update_analysis": _update_analysis,
+            "add_user": _add_user,
+            "update_user_role": _update_user_role,
+            "delete_user": _delete_user,
+        }
+    )
+)
+
+
+@auth_bp.route("/settings", methods=["GET", "POST"])
+@require_roles(
+    ADMIN_ROLES, "Administrator access is required to view settings.", "view_settings"
+)
+def settings(user: User) -> Any:
+    """Administrative configuration dashboard for application owners."""
+
+    if request.method == "POST":
+        action = request.form.get("action", "").strip()
+        handler = SETTINGS_ACTIONS.get(action)
+        if handler is None:
             flash("The requested action is not recognised.", "error")
+        else:
+            flash(*handler(request.form, user))
 
-    settings_values = {
-        key: ApplicationSetting.get_value(key, default)
-        for key, default in settings_defaults.items()
-    }
+    settings_values = ApplicationSetting.get_many(SETTINGS_DEFAULTS)
 
-    users = User.query.order_by(User.username).all()
-    role_labels = {role.value: role.label for role in Role}
+    # The directory only shows these columns, so password hashes are never
+    # loaded and no ORM identity-map entries are built per user.
+    users = db.session.execute(
+        select(User.id, User.username, User.role).order_by(User.username)
+    ).all()
     admin_users = [u for u in users if u.role == Role.ADMIN.value]
 
     return render_template(
@@ -501,29 +654,27 @@ def settings() -> Any:
         user=user,
         settings_values=settings_values,
         users=users,
-        role_labels=role_labels,
-        roles=list(Role),
         admin_users=admin_users,
     )
 
 
 @auth_bp.route("/analysis")
-def analysis() -> Any:
+@require_roles(
+    ANALYSIS_ROLES,
+    "Analysis mode is available to managers and administrators only.",
+    "view_analysis",
+)
+def analysis(user: User) -> Any:
     """Advanced analytics view for leadership roles."""
 
-    user = ensure_logged_in()
-    if user is None:
-        return redirect(url_for("auth.login"))
-
-    if user.role_enum not in {Role.ADMIN, Role.MANAGER}:
-        flash("Analysis mode is available to managers and administrators only.", "error")
-        return redirect(url_for("auth.dashboard"))
-
-    record_session_event("view_analysis", user=user)
-
-    total_entries = EmployeeSubmission.query.count()
-    average_score = db.session.query(func.avg(EmployeeSubmission.performance_score)).scalar() or 0
-    latest_submission = db.session.query(func.max(EmployeeSubmission.submitted_at)).scalar()
+    total_entries, average_score, latest_submission = db.session.execute(
+        select(
+            func.count(EmployeeSubmission.id),
+            func.avg(EmployeeSubmission.performance_score),
+            func.max(EmployeeSubmission.submitted_at),
+        )
+    ).one()
+    average_score = average_score or 0
 
     department_breakdown = (
         db.session.query(
@@ -553,11 +704,7 @@ def analysis() -> Any:
         EmployeeSubmission.query.order_by(EmployeeSubmission.submitted_at.desc()).limit(6).all()
     )
 
-    settings_snapshot = {
-        "analysis_focus": ApplicationSetting.get_value("analysis_focus", "Quality & Throughput"),
-        "data_source": ApplicationSetting.get_value("data_source", "sqlite:///instance/app.db"),
-        "refresh_interval": ApplicationSetting.get_value("refresh_interval", "Hourly"),
-    }
+    settings_snapshot = ApplicationSetting.get_many(ANALYSIS_SETTING_DEFAULTS)
 
     return render_template(
         "auth/analysis.html",
@@ -569,24 +716,18 @@ def analysis() -> Any:
         top_performers=top_performers,
         recent_entries=recent_entries,
         settings_snapshot=settings_snapshot,
-        role_labels={role.value: role.label for role in Role},
-        Role=Role,
     )
 
 
 @auth_bp.route("/admin/session-log")
-def session_log() -> Any:
+@require_roles(
+    ADMIN_ROLES, "The session log is restricted to administrators.", "view_session_log"
+)
+def session_log(user: User) -> Any:
     """Administrative view summarising recorded interaction data."""
 
-    user = ensure_logged_in()
-    if user is None:
-        return redirect(url_for("auth.login"))
-
-    if user.role_enum is not Role.ADMIN:
-        flash("The session log is restricted to administrators.", "error")
-        return redirect(url_for("auth.dashboard"))
-
-    record_session_event("view_session_log", user=user)
+    # Make events still waiting in the write-behind queue visible below.
+    flush_session_events()
 
     area_usage = (
         db.session.query(
@@ -624,16 +765,24 @@ def session_log() -> Any:
         .all()
     )
 
-    report_by_area: dict[str, int] = {}
-    for event in SessionEvent.query.filter_by(event_type="report_selected"):
-        details = load_event_details(event)
-        area = str(details.get("area") or "").strip()
-        if not area:
-            continue
-        report_by_area[area] = report_by_area.get(area, 0) + 1
+    report_by_area: dict[str, int] = dict(
+        db.session.query(SessionEvent.area, func.count(SessionEvent.id))
+        .filter(
+            SessionEvent.event_type == "report_selected",
+            SessionEvent.area.isnot(None),
+        )
+        .group_by(SessionEvent.area)
+        .all()
+    )
 
-    distinct_sessions = db.session.query(SessionEvent.session_id).distinct().count()
-    total_events = SessionEvent.query.count()
+    # One aggregate SELECT rather than two ``Query.count()`` calls, each of
+    # which wraps its query in a derived table.
+    distinct_sessions, total_events = db.session.execute(
+        select(
+            func.count(func.distinct(SessionEvent.session_id)),
+            func.count(SessionEvent.id),
+        )
+    ).one()
 
     recent_events = [
         {
@@ -645,7 +794,21 @@ def session_log() -> Any:
             "details": load_event_details(event),
             "path": event.path,
         }
-        for event in SessionEvent.query.order_by(SessionEvent.created_at.desc()).limit(200)
+        # Plain rows: the listing is read-only, so ORM instances and their
+        # identity-map bookkeeping would be wasted on every admin page load.
+        for event in db.session.execute(
+            select(
+                SessionEvent.created_at,
+                SessionEvent.session_id,
+                SessionEvent.username,
+                SessionEvent.event_type,
+                SessionEvent.context_value,
+                SessionEvent.event_details,
+                SessionEvent.path,
+            )
+            .order_by(SessionEvent.created_at.desc())
+            .limit(200)
+        )
     ]
 
     return render_template(
@@ -0,0 +1,159 @@
+"""Write-behind persistence for :class:`~app.models.SessionEvent` rows."""
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Any
+
+from flask import Flask, current_app
+from sqlalchemy import insert
+
+from ..extensions import db
+from ..models import SessionEvent
+
+__all__ = [
+    "SessionEventWriter",
+    "flush_session_events",
+    "init_session_events",
+    "queue_session_event",
+]
+
+_EXTENSION_KEY = "session_event_writer"
+
+
+class SessionEventWriter:
+    """Collect session events in memory and insert them in batches.
+
+    Events are queued by request threads and written by a daemon thread with
+    one ``executemany`` INSERT per batch. A batch is written once it reaches
+    ``batch_size`` rows or ``flush_interval`` seconds after its first event
+    arrived, whichever comes first. A ``batch_size`` below 1 disables the
+    queue and writes each event immediately.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        batch_size: int = 200,
+        flush_interval: float = 0.1,
+        max_queue_size: int = 10_000,
+    ):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self._reset()
+
+    def _reset(self) -> None:
+        # Threads do not survive ``fork``; Gunicorn workers forked from a
+        # preloaded master start their own queue and thread on first use.
+        self._pid = os.getpid()
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(self.max_queue_size)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        if self._pid != os.getpid():
+            self._reset()
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="session-event-writer", daemon=True
+                )
+                self._thread.start()
+
+    def enqueue(self, row: dict[str, Any]) -> None:
+        """Queue ``row`` for insertion, writing it inline when queueing is unavailable."""
+
+        if self.batch_size < 1:
+            self._write([row])
+            return
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            current_app.logger.warning("Session event queue is full; writing inline")
+            self._write([row])
+
+    def flush(self) -> None:
+        """Write every queued event and wait for any batch already in flight."""
+
+        if self._pid != os.getpid():
+            return
+
+        rows = self._drain(self._queue.qsize())
+        if rows:
+            self._write(rows)
+            for _ in rows:
+                self._queue.task_done()
+        self._queue.join()
+
+    def _drain(self, limit: int) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        while len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, rows: list[dict[str, Any]]) -> None:
+        # A dedicated app context gives the batch its own session, so request
+        # transactions are never committed or rolled back by the writer.
+        with self.app.app_context():
+            try:
+                db.session.execute(insert(SessionEvent), rows)
+                db.session.commit()
+            except Exception:  # pragma: no cover - logged and dropped
+                db.session.rollback()
+                self.app.logger.exception("Failed to persist %s session events", len(rows))
+
+
+def init_session_events(app: Flask) -> SessionEventWriter:
+    """Attach a :class:`SessionEventWriter` configured from ``app.config``."""
+
+    writer = SessionEventWriter(
+        app,
+        batch_size=app.config.get("SESSION_EVENT_BATCH_SIZE", 200),
+        flush_interval=app.config.get("SESSION_EVENT_FLUSH_MS", 100) / 1000,
+    )
+    app.extensions[_EXTENSION_KEY] = writer
+    atexit.register(writer.flush)
+    return writer
+
+
+def queue_session_event(row: dict[str, Any]) -> None:
+    """Queue a ``SessionEvent`` column mapping on the current app's writer."""
+
+    current_app.extensions[_EXTENSION_KEY].enqueue(row)
+
+
+def flush_session_events() -> None:
+    """Persist all pending session events for the current app."""
+
+    current_app.extensions[_EXTENSION_KEY].flush()
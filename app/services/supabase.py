@@ -1,7 +1,7 @@
 """Helper for interacting with the Supabase REST API."""
 from __future__ import annotations
 
-import json
+import time
 from typing import Any
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
@@ -13,6 +13,8 @@ __all__ = [
     "SupabaseConfigurationError",
     "SupabaseRequestError",
     "fetch_defect_definitions",
+    "fetch_defect_definitions_if_changed",
+    "get_defects_etag",
 ]
 
 
@@ -28,7 +30,7 @@ class SupabaseRequestError(SupabaseError):
     """Raised when a Supabase API call fails."""
 
 
-def _build_request(path: str) -> Request:
+def _build_request(path: str, extra_headers: dict[str, str] | None = None) -> Request:
     """Return a configured :class:`urllib.request.Request` for ``path``."""
 
     base_url: str | None = current_app.config.get("SUPABASE_URL")
@@ -46,19 +48,27 @@ def _build_request(path: str) -> Request:
         "Accept": "application/json",
         "User-Agent": "reporting-software/1.0",
     }
+    if extra_headers:
+        headers.update(extra_headers)
 
     return Request(url, headers=headers)
 
 
-def _execute(request: Request) -> Any:
-    """Execute ``request`` and return the decoded JSON payload."""
+def _execute_conditional(request: Request) -> tuple[Any, str | None]:
+    """Execute ``request`` and return ``(payload, etag)``.
+
+    ``payload`` is ``None`` when the server answers ``304 Not Modified``.
+    """
 
     timeout: int = current_app.config.get("SUPABASE_TIMEOUT", 10)
 
     try:
         with urlopen(request, timeout=timeout) as response:  # noqa: S310 (trusted URL)
             payload = response.read()
+            etag = response.headers.get("ETag")
     except HTTPError as exc:  # pragma: no cover - exercised via integration tests
+        if exc.code == 304:
+            return None, exc.headers.get("ETag") if exc.headers else None
         detail = ""
         if exc.fp is not None:
             try:
@@ -70,16 +80,64 @@ def _execute(request: Request) -> Any:
         raise SupabaseRequestError(str(exc.reason)) from exc
 
     try:
-        return json.loads(payload)
-    except json.JSONDecodeError as exc:  # pragma: no cover - defensive
+        return current_app.json.loads(payload), etag
+    except ValueError as exc:  # pragma: no cover - defensive
         raise SupabaseRequestError("Supabase response could not be decoded as JSON") from exc
 
 
+# Last successful defects response as ``(fetched_at, defects, etag)``; reused
+# for ``SUPABASE_DEFECTS_TTL`` seconds instead of asking Supabase again.
+_DEFECTS_CACHE: tuple[float, list[dict[str, int | str | None]], str | None] | None = None
+
+
+def get_defects_etag() -> str | None:
+    """Return the ETag of the last defects payload this process received.
+
+    The tag outlives ``SUPABASE_DEFECTS_TTL``, so it can still be sent as
+    ``If-None-Match`` once the cached list is too old to serve directly.
+    """
+
+    return _DEFECTS_CACHE[2] if _DEFECTS_CACHE is not None else None
+
+
 def fetch_defect_definitions() -> list[dict[str, int | str | None]]:
     """Return defect definitions from Supabase as ``id``/``name`` pairs."""
 
-    request = _build_request("rest/v1/defects?select=*&order=id.asc")
-    payload = _execute(request)
+    defects, _ = fetch_defect_definitions_if_changed()
+    return defects or []
+
+
+def fetch_defect_definitions_if_changed(
+    etag: str | None = None,
+) -> tuple[list[dict[str, int | str | None]] | None, str | None]:
+    """Return ``(defects, etag)`` using a conditional request when ``etag`` is set.
+
+    ``defects`` is ``None`` when Supabase reports the table unchanged since
+    ``etag`` was issued; the caller can then skip parsing and diffing entirely.
+    A response fetched within the last ``SUPABASE_DEFECTS_TTL`` seconds is
+    answered from memory without contacting Supabase.
+    """
+
+    global _DEFECTS_CACHE
+
+    ttl = current_app.config.get("SUPABASE_DEFECTS_TTL", 300)
+    if _DEFECTS_CACHE is not None and time.monotonic() - _DEFECTS_CACHE[0] < ttl:
+        _, cached_defects, cached_etag = _DEFECTS_CACHE
+        if etag and cached_etag == etag:
+            return None, etag
+        return list(cached_defects), cached_etag
+
+    headers = {"If-None-Match": etag} if etag else None
+    # Only the columns parsed below, to keep the response body small.
+    request = _build_request("rest/v1/defects?select=id,name,part_type&order=id.asc", headers)
+    payload, response_etag = _execute_conditional(request)
+
+    if payload is None:
+        response_etag = response_etag or etag
+        if _DEFECTS_CACHE is not None and _DEFECTS_CACHE[2] == response_etag:
+            # Revalidated upstream; keep serving the cached list.
+            _DEFECTS_CACHE = (time.monotonic(), *_DEFECTS_CACHE[1:])
+        return None, response_etag
 
     if not isinstance(payload, list):
         raise SupabaseRequestError("Unexpected Supabase response shape for defects table")
@@ -115,4 +173,5 @@ def fetch_defect_definitions() -> list[dict[str, int | str | None]]:
 
         defects.append({"id": code, "name": name, "part_type": part_type})
 
-    return defects
+    _DEFECTS_CACHE = (time.monotonic(), defects, response_etag)
+    return list(defects), response_etag